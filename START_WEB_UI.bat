@@ -12,11 +12,11 @@ echo  [1] Starting virtual environment...
 call venv\Scripts\activate.bat
 
 echo  [2] Checking dependencies...
-python -c "import flask, flask_cors, pandas, sqlalchemy" 2>nul
+python -c "import flask, flask_cors, flask_caching, waitress, pandas, sqlalchemy" 2>nul
 if errorlevel 1 (
     echo.
     echo  [!] Missing dependencies detected. Installing...
-    pip install -q flask flask-cors pandas sqlalchemy
+    pip install -q flask flask-cors flask-caching waitress pandas sqlalchemy
 )
 
 echo  [3] Starting web server...
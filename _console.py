@@ -0,0 +1,11 @@
+"""
+Console output setup for the test scripts
+"""
+
+import sys
+
+
+def use_utf8_stdout():
+    """Print UTF-8 on the Windows console (its default code page can't encode the listing text)"""
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
@@ -0,0 +1,46 @@
+"""
+Disk cache of fetched OneHome pages for the test scripts
+
+Re-running a script on the same email reads the page from disk instead of
+loading it again. Entries expire after PAGE_CACHE_TTL seconds
+(ONEHOME_CACHE_TTL=0 in the environment disables the cache).
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+from utils.files import write_text_atomic
+
+PAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'onehome_cache')
+PAGE_CACHE_TTL = int(os.getenv('ONEHOME_CACHE_TTL', 3600))
+
+
+def _cache_path(key):
+    """File of a cache entry (keys are URLs - hashed to a safe file name)"""
+    return os.path.join(PAGE_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def get_page(key):
+    """Cached bytes for key, or None if missing or expired"""
+    if PAGE_CACHE_TTL <= 0:
+        return None
+
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > PAGE_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def put_page(key, data):
+    """Store bytes for key"""
+    if PAGE_CACHE_TTL <= 0:
+        return
+
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    write_text_atomic(_cache_path(key), data)
@@ -0,0 +1,10 @@
+"""
+Regex patterns shared by the OneHome test scripts (compiled once at import)
+"""
+
+import re
+
+# OneHome property link in a CML email body
+# The lazy prefix stops at the first 'properties' instead of running to the end of the URL and backtracking
+# The character class stays: \S would run past the closing quote of href="..."
+ONEHOME_URL = re.compile(r'https://portal\.onehome\.com/[^\s<>"\']+?properties[^\s<>"\']+')
@@ -80,7 +80,6 @@ def find_correct_link():
         if mls_in_url:
             print(f"    -> Contains ID: {mls_in_url.group(1)}")
 
-    monitor.imap.logout()
     print("\n" + "=" * 60)
 
 if __name__ == "__main__":
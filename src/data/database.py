@@ -1,11 +1,11 @@
 """
 Модели базы данных и ORM для проекта Asheville Land Analyzer
-Использует SQLAlchemy для работы с PostgreSQL
+Использует SQLAlchemy; база - SQLite или PostgreSQL (задается DATABASE_URL)
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, Index
+from sqlalchemy import create_engine, event, make_url, Column, Integer, String, Float, DateTime, Boolean, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, relationship
 from datetime import datetime
 import sys
 import os
@@ -21,15 +21,41 @@ from config import DATABASE_URL
 # Базовый класс для всех моделей
 Base = declarative_base()
 
+# Размер пула рассчитан на многопоточный веб-сервер (см. web/wsgi.py)
+# Для SQLite остается пул SQLAlchemy по умолчанию
+if make_url(DATABASE_URL).get_backend_name() == 'sqlite':
+    pool_options = {}
+else:
+    pool_options = {
+        'pool_size': 20,  # Постоянных соединений в пуле
+        'max_overflow': 40  # Дополнительных соединений при пиковой нагрузке
+    }
+
 # Engine с настройками подключения
 # pool_pre_ping=True для автопереподключения при потере соединения
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Не логировать SQL запросы
-    pool_pre_ping=True  # Проверять соединение перед использованием
+    pool_pre_ping=True,  # Проверять соединение перед использованием
+    query_cache_size=1200,  # Кэш скомпилированных SQL выражений (по умолчанию 500)
+    **pool_options
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_wal(dbapi_connection, connection_record):
+    """
+    Включает WAL для SQLite: чтение (веб-интерфейс) не блокируется импортом CSV
+    Для других БД ничего не делает
+    """
+    if engine.dialect.name == 'sqlite':
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
 # Фабрика сессий
+# autoflush=False - чтение не запускает flush и проверку изменений
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 # ============================================================================
@@ -92,6 +118,10 @@ class Property(Base):
         Index('idx_location', 'latitude', 'longitude'),
         Index('idx_street_city', 'street_name', 'city'),
         Index('idx_status_date', 'status', 'sale_date'),
+        # Карта/API: archived = False и координаты не NULL
+        Index('idx_archived_location', 'archived', 'latitude', 'longitude'),
+        # Список городов с количеством домов (GROUP BY city)
+        Index('idx_city_archived', 'city', 'archived'),
     )
 
 
@@ -177,6 +207,19 @@ class LandOpportunity(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Связанный дом из MLS (по MLS номеру, без отдельного внешнего ключа)
+    property = relationship(
+        'Property',
+        primaryjoin='foreign(LandOpportunity.mls_number) == Property.mls_number',
+        uselist=False,
+        viewonly=True
+    )
+
+    # Индекс для выборки топа по urgency_score (ORDER BY ... LIMIT)
+    __table_args__ = (
+        Index('idx_urgency_score_mls', 'urgency_score', 'mls_number'),
+    )
+
 
 class MarketHeatZone(Base):
     """
@@ -16,6 +16,7 @@ import sys
 # Добавляем родительскую директорию в path для импорта config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import CITY_CENTER
+from utils.rate_limiter import nominatim_limiter
 
 # ============================================================================
 # ИНИЦИАЛИЗАЦИЯ
@@ -25,7 +26,7 @@ from config import CITY_CENTER
 CACHE_FILE = 'data/cache/geocode_cache.json'
 
 # Инициализация геокодера Nominatim
-# ВАЖНО: Nominatim имеет лимит 1 запрос в секунду
+# ВАЖНО: Nominatim имеет лимит 1 запрос в секунду (см. nominatim_limiter)
 geolocator = Nominatim(user_agent="asheville_land_analyzer_v1", timeout=10)
 
 # Глобальный кеш (загружается при первом использовании)
@@ -173,13 +174,11 @@ def fallback_geocode(address: str) -> Optional[Tuple[float, float]]:
         street_only = extract_street_name(address)
         full_address = f"{street_only}, Asheville, NC"
 
+        nominatim_limiter.acquire()  # Лимит Nominatim
         location = geolocator.geocode(full_address)
         if location:
             if validate_coordinates(location.latitude, location.longitude):
-                time.sleep(1)  # Лимит Nominatim
                 return (location.latitude, location.longitude)
-
-        time.sleep(1)
     except (GeocoderTimedOut, GeocoderServiceError):
         time.sleep(2)
 
@@ -189,6 +188,7 @@ def fallback_geocode(address: str) -> Optional[Tuple[float, float]]:
     if zip_match:
         try:
             zip_code = zip_match.group(0)
+            nominatim_limiter.acquire()
             location = geolocator.geocode(f"{zip_code}, NC")
 
             if location:
@@ -197,10 +197,7 @@ def fallback_geocode(address: str) -> Optional[Tuple[float, float]]:
                 lon = location.longitude + random.uniform(-0.01, 0.01)
 
                 if validate_coordinates(lat, lon):
-                    time.sleep(1)
                     return (lat, lon)
-
-            time.sleep(1)
         except (GeocoderTimedOut, GeocoderServiceError):
             time.sleep(2)
 
@@ -236,6 +233,9 @@ def geocode_address(address: str) -> Optional[Tuple[float, float]]:
         try:
             # Полный адрес с городом и штатом
             full_address = f"{address}, Asheville, NC"
+
+            # Лимит API - 1 запрос в секунду (ждем только если токена нет)
+            nominatim_limiter.acquire()
             location = geolocator.geocode(full_address)
 
             if location:
@@ -246,13 +246,9 @@ def geocode_address(address: str) -> Optional[Tuple[float, float]]:
                     # Сохранить в кеш
                     cache[address] = coords
                     save_geocode_cache(cache)
-
-                    # Лимит API - 1 запрос в секунду
-                    time.sleep(1)
                     return coords
 
             # Если не нашли - fallback
-            time.sleep(1)
             break
 
         except GeocoderTimedOut:
@@ -301,11 +297,8 @@ def batch_geocode(addresses: List[str]) -> List[Optional[Tuple[float, float]]]:
         if address in cache:
             results.append(cache[address])
         else:
-            # Геокодировать
+            # Геокодировать (лимит Nominatim соблюдается внутри geocode_address)
             coords = geocode_address(address)
             results.append(coords)
 
-            # Задержка между запросами (Nominatim лимит)
-            time.sleep(1)
-
     return results
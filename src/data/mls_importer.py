@@ -21,6 +21,9 @@ from analyzers.price_calculator import (
 )
 from config import ARCHIVE_SOLD_AFTER_DAYS
 
+# Размер чанка при потоковом чтении CSV (строк)
+CHUNK_SIZE = 10_000
+
 
 def normalize_redfin_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -105,7 +108,8 @@ def check_duplicate(mls_number: str) -> Optional[Property]:
         session.close()
 
 
-def update_property_status(session, mls_number: str, new_data: Dict) -> Property:
+def update_property_status(session, mls_number: str, new_data: Dict,
+                           existing: Optional[Property] = None) -> Property:
     """
     Обновляет статус существующего дома если изменился
 
@@ -113,12 +117,14 @@ def update_property_status(session, mls_number: str, new_data: Dict) -> Property
         session: SQLAlchemy сессия
         mls_number: MLS номер дома
         new_data: Новые данные из CSV
+        existing: Уже загруженный в эту сессию Property (если есть - без запроса к БД)
 
     Returns:
         Обновленный Property объект
     """
     # Получить объект в текущей сессии
-    existing = session.query(Property).filter_by(mls_number=mls_number).first()
+    if existing is None:
+        existing = session.query(Property).filter_by(mls_number=mls_number).first()
 
     if not existing:
         return None
@@ -326,76 +332,98 @@ def import_csv_file(file_path: str) -> int:
     """
     print(f"📥 Начинаю импорт: {file_path}")
 
-    # 1. Загрузка CSV
+    # 1. Потоковое чтение CSV чанками (память O(CHUNK_SIZE), а не O(файла))
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        print(f"✓ Загружено строк: {len(df)}")
-
-        # Удалить строки, которые являются служебными сообщениями
-        # (например, "In accordance with local MLS rules...")
-        df = df[~df.iloc[:, 0].astype(str).str.contains('In accordance', na=False)]
-        df = df.reset_index(drop=True)
-
+        chunks = pd.read_csv(file_path, encoding='utf-8-sig', chunksize=CHUNK_SIZE)
     except Exception as e:
         print(f"❌ Ошибка чтения CSV: {e}")
         return 0
 
-    # 1.5. Нормализация колонок Redfin (если это Redfin CSV)
-    if 'ADDRESS' in df.columns or 'SQUARE FEET' in df.columns:
-        print("Обнаружен формат Redfin CSV, нормализую колонки...")
-        df = normalize_redfin_columns(df)
-        print("✓ Колонки нормализованы")
-
-    # 2. Валидация структуры
-    if not validate_csv_structure(df):
-        print("❌ Структура CSV невалидна")
-        return 0
-
-    print("✓ Структура CSV валидна")
-
-    # 3. Счетчики
+    # 2. Счетчики
     new_count = 0
     updated_count = 0
     skipped_count = 0
+    total_rows = 0
 
-    # 4. Получить сессию БД
+    # 3. Получить сессию БД
     session = get_session()
 
-    # 5. Обработка каждой строки
+    # 4. Обработка каждого чанка
     try:
-        for idx, row in df.iterrows():
-            # Обработать строку
-            property_obj = process_single_property(row)
-
-            if property_obj is None:
-                skipped_count += 1
-                continue
-
-            # Проверить на дубликат
-            existing = check_duplicate(property_obj.mls_number)
-
-            if existing:
-                # Обновить статус и URL если изменился
-                new_data = {
-                    'status': property_obj.status,
-                    'sale_date': property_obj.sale_date,
-                    'sale_price': property_obj.sale_price,
-                    'url': property_obj.url
+        for chunk_idx, df in enumerate(chunks):
+            # Удалить строки, которые являются служебными сообщениями
+            # (например, "In accordance with local MLS rules...")
+            df = df[~df.iloc[:, 0].astype(str).str.contains('In accordance', na=False)]
+            df = df.reset_index(drop=True)
+
+            # Нормализация колонок Redfin (если это Redfin CSV)
+            if 'ADDRESS' in df.columns or 'SQUARE FEET' in df.columns:
+                if chunk_idx == 0:
+                    print("Обнаружен формат Redfin CSV, нормализую колонки...")
+                df = normalize_redfin_columns(df)
+
+            # Валидация структуры (колонки одинаковые во всех чанках)
+            if chunk_idx == 0:
+                if not validate_csv_structure(df):
+                    print("❌ Структура CSV невалидна")
+                    return 0
+                print("✓ Структура CSV валидна")
+
+            total_rows += len(df)
+
+            # Обработать строки чанка
+            property_objs = []
+            for _, row in df.iterrows():
+                property_obj = process_single_property(row)
+
+                if property_obj is None:
+                    skipped_count += 1
+                    continue
+
+                property_objs.append(property_obj)
+
+            # Загрузить существующие дома одним запросом на весь чанк
+            # (и для проверки дубликатов, и для обновления без запроса на каждую строку)
+            chunk_mls = list({obj.mls_number for obj in property_objs})
+            existing_by_mls = {}
+            if chunk_mls:
+                existing_by_mls = {
+                    prop.mls_number: prop for prop in session.query(Property).filter(
+                        Property.mls_number.in_(chunk_mls)
+                    )
                 }
-                update_property_status(session, property_obj.mls_number, new_data)
-                updated_count += 1
-            else:
-                # Добавить новый
-                session.add(property_obj)
-                new_count += 1
 
-            # Commit каждые 100 записей для производительности
-            if (idx + 1) % 100 == 0:
-                session.commit()
-                print(f"  Обработано: {idx + 1}/{len(df)}")
-
-        # Финальный commit
-        session.commit()
+            new_objs = []
+            pending_mls = set()
+            for property_obj in property_objs:
+                if property_obj.mls_number in existing_by_mls:
+                    # Обновить статус и URL если изменился
+                    new_data = {
+                        'status': property_obj.status,
+                        'sale_date': property_obj.sale_date,
+                        'sale_price': property_obj.sale_price,
+                        'url': property_obj.url
+                    }
+                    update_property_status(
+                        session, property_obj.mls_number, new_data,
+                        existing=existing_by_mls[property_obj.mls_number]
+                    )
+                    updated_count += 1
+                elif property_obj.mls_number in pending_mls:
+                    # Повтор MLS номера внутри файла
+                    skipped_count += 1
+                else:
+                    new_objs.append(property_obj)
+                    pending_mls.add(property_obj.mls_number)
+
+            # Массовая вставка новых домов и commit один раз на чанк
+            session.bulk_save_objects(new_objs)
+            new_count += len(new_objs)
+            session.commit()
+
+            print(f"  Обработано: {total_rows}")
+
+        print(f"✓ Загружено строк: {total_rows}")
         print("✓ Все данные сохранены в БД")
 
     except Exception as e:
@@ -416,6 +444,6 @@ def import_csv_file(file_path: str) -> int:
     print(f"  🔄 Обновлено статусов: {updated_count}")
     print(f"  ⏭️  Пропущено (ошибки): {skipped_count}")
     print(f"  📦 Архивировано: {archived_count}")
-    print(f"  📝 Всего обработано: {len(df)}")
+    print(f"  📝 Всего обработано: {total_rows}")
 
     return new_count
@@ -5,6 +5,7 @@
 
 import folium
 from folium import Marker, Icon, FeatureGroup
+from sqlalchemy.orm import joinedload
 import sys
 import os
 
@@ -97,8 +98,10 @@ def add_land_opportunities_layer(map_obj: folium.Map) -> None:
     """
     session = get_session()
     try:
-        # Получить все земельные возможности
-        opportunities = session.query(LandOpportunity).all()
+        # Получить все земельные возможности вместе с домами (один запрос)
+        opportunities = session.query(LandOpportunity).options(
+            joinedload(LandOpportunity.property)
+        ).all()
 
         # Создать feature groups по уровню срочности
         urgent_group = FeatureGroup(name='🔥 Urgent Land (Score ≥80)')
@@ -121,8 +124,8 @@ def add_land_opportunities_layer(map_obj: folium.Map) -> None:
 
         # Для каждой возможности добавить маркер
         for opp in opportunities:
-            # Получить связанный Property объект
-            prop = session.query(Property).filter_by(id=opp.property_id).first()
+            # Связанный Property объект (уже загружен через joinedload)
+            prop = opp.property
 
             if not prop or not prop.latitude or not prop.longitude:
                 continue
@@ -3,15 +3,21 @@ Email Monitor for Land Listings
 Monitors email inbox for new land listings and analyzes their potential
 """
 
+import atexit
 import imaplib
-import email
-from email.header import decode_header
+from email.parser import BytesParser
+from email.policy import default as email_default
 import re
 import time
 import json
 import logging
+import queue
+import select
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import os
 import sys
 
@@ -21,6 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from data.database import get_session, Property
 from analyzers.zone_analyzer import analyze_nearby_zones
 from notifications.telegram_bot import send_telegram_alert
+from utils.rate_limiter import nominatim_limiter
 
 # Set up logging
 logging.basicConfig(
@@ -29,6 +36,145 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Mailbox position persisted between runs (last processed UID)
+STATE_FILE = 'email_state.json'
+
+# Processed message sequence numbers written by earlier versions of the monitor
+LEGACY_STATE_FILE = 'processed_emails.json'
+
+# UID of a message in an IMAP FETCH response envelope (b'12 (UID 345 RFC822 {6789}')
+_FETCH_UID_RE = re.compile(rb'UID (\d+)')
+
+# Servers drop idle IMAP sessions after ~30 minutes - check liveness with NOOP before that
+IMAP_NOOP_AFTER_SECONDS = 25 * 60
+
+# RFC 2177: clients must re-issue IDLE at least every 29 minutes
+IMAP_IDLE_MAX_SECONDS = 25 * 60
+
+# Logged-in IMAP connections shared within the process: (server, username) -> [imap, last_used]
+_CONN_CACHE: Dict[Tuple[str, str], list] = {}
+
+
+def get_imap(email_config: dict) -> imaplib.IMAP4_SSL:
+    """Return a logged-in IMAP connection, reusing the cached one while it is alive"""
+    key = (email_config['server'], email_config['username'])
+    cached = _CONN_CACHE.get(key)
+
+    if cached:
+        imap, last_used = cached
+        try:
+            if time.monotonic() - last_used > IMAP_NOOP_AFTER_SECONDS:
+                imap.noop()
+            cached[1] = time.monotonic()
+            return imap
+        except (imaplib.IMAP4.error, OSError) as e:
+            logger.info(f"Cached IMAP connection is dead ({e}), reconnecting")
+            del _CONN_CACHE[key]
+
+    imap = imaplib.IMAP4_SSL(email_config['server'], email_config['port'])
+    imap.login(email_config['username'], email_config['password'])
+    _CONN_CACHE[key] = [imap, time.monotonic()]
+    return imap
+
+
+@atexit.register
+def _logout_cached_imap():
+    """Log out of every cached IMAP connection on interpreter exit"""
+    for imap, _ in _CONN_CACHE.values():
+        try:
+            imap.logout()
+        except (imaplib.IMAP4.error, OSError):
+            pass
+    _CONN_CACHE.clear()
+
+
+# OneHome single-listing links (/listing?, not the /properties list pages)
+_ONEHOME_RE = re.compile(r'https://portal\.onehome\.com/[^\s<>"\']+/listing\?[^\s<>"\']+')
+
+# "Highlights" card of a listing in a CML email: <a class="highlights-details" href="..."> price, address, MLS </a>
+_EMAIL_CARD_RE = re.compile(r'<a class="highlights-details" href="([^"]+)"[^>]*>(.*?)</a>', re.DOTALL)
+_CARD_FIELD_PATTERNS = {
+    'price': re.compile(r'class=[\'"]highlight-price[\'"][^>]*>\s*\$([0-9,]+)'),
+    'address': re.compile(r'class=[\'"]highlight-description[\'"][^>]*>\s*([^<]+?)\s*<'),
+    'city': re.compile(r'class=[\'"]highlight-address[\'"][^>]*>\s*([^<,]+),'),
+    'mls': re.compile(r'MLS\s*#\s*(\w+)'),
+}
+
+# Field patterns for listing details in email bodies (tried in order, first match wins)
+_FIELD_PATTERNS = {
+    'price': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'\$([0-9,]+)',
+        r'Price:\s*\$([0-9,]+)',
+        r'Asking:\s*\$([0-9,]+)',
+        r'Listed at:\s*\$([0-9,]+)'
+    )),
+    'acres': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+\.?\d*)\s*acres?',
+        r'(\d+\.?\d*)\s*ac\b',
+        r'Lot Size:\s*(\d+\.?\d*)\s*acres?'
+    )),
+    'sqft': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+,?\d*)\s*sq\.?\s*ft',
+        r'(\d+,?\d*)\s*square feet',
+        r'Lot Size:\s*(\d+,?\d*)\s*sq'
+    )),
+    'address': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'(?:Address|Location|Property):\s*(.+?)(?:\n|$)',
+        r'(\d+\s+[\w\s]+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Circle|Ct|Court))',
+    )),
+    'city': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'(?:City|Location):\s*(\w+)',
+        r',\s*(\w+)\s*,?\s*NC',
+        r'in\s+(\w+),?\s*NC'
+    )),
+    'mls': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'MLS\s*#?\s*(\w+)',
+        r'Listing\s*#?\s*(\w+)',
+        r'ID:\s*(\w+)'
+    ))
+}
+
+# Field patterns for OneHome property pages (rendered page text has a different layout)
+_ONEHOME_FIELD_PATTERNS = {
+    'price': tuple(re.compile(p) for p in (
+        r'List Price:\s*\$([0-9,]+)',
+        r'Price:\s*\$([0-9,]+)',
+        r'Asking:\s*\$([0-9,]+)'
+    )),
+    'acres': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+\.?\d*)\s*acres?',
+        r'(\d+\.?\d*)\s*ac\b',
+        r'Lot Size:\s*(\d+\.?\d*)\s*acres?',
+        r'Acres:\s*(\d+\.?\d*)'
+    )),
+    'address': tuple(re.compile(p) for p in (
+        r'(?:Address|Location|Property):\s*(.+?)(?:\n|,\s*NC)',
+        r'(\d+\s+[\w\s]+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Circle|Ct|Court|Blvd|Boulevard)[,\s]+[\w\s]+,\s*NC)',
+    )),
+    'mls': tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'MLS\s*#?\s*[:.]?\s*([A-Z0-9\-]+)',
+        r'MLS Number:\s*([A-Z0-9\-]+)',
+        r'Listing\s*#?\s*[:.]?\s*([A-Z0-9\-]+)',
+        r'ID:\s*([A-Z0-9\-]+)'
+    ))
+}
+
+_ALL_PRICES_RE = re.compile(r'\$([0-9,]+)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_ADDRESS_CITY_RE = re.compile(r',\s*(\w+)\s*,?\s*NC')
+
+
+def _scan_fields(text: str, fields: Iterable[str], patterns: Dict = _FIELD_PATTERNS) -> Dict[str, re.Match]:
+    """Run each field's patterns over text once and return the first match per field"""
+    found = {}
+    for field in fields:
+        for pattern in patterns[field]:
+            match = pattern.search(text)
+            if match:
+                found[field] = match
+                break
+    return found
+
 
 class EmailMonitor:
     """Monitor email for land listings and analyze opportunities"""
@@ -37,8 +183,14 @@ class EmailMonitor:
         """Initialize email monitor with configuration"""
         self.config = self.load_config(config_path)
         self.imap = None
-        self.processed_emails = set()  # Track processed email IDs
-        self.load_processed_emails()
+        self._driver_pool = None  # Shared headless Chrome drivers (created lazily)
+        self._page_executor = None  # Shared page-loading threads (created lazily)
+        self._driver_pool_lock = threading.Lock()  # Emails are processed in parallel
+        self._idle_count = 0  # Tags of our own IMAP IDLE commands
+        self._geocode_cache = {}  # Full address -> (lat, lng)
+        self.last_uid = 0  # Highest processed message UID
+        self.uid_validity = None  # Mailbox UIDVALIDITY the UID belongs to
+        self.load_state()
 
     def load_config(self, config_path: str) -> dict:
         """Load configuration from JSON file"""
@@ -73,27 +225,28 @@ class EmailMonitor:
             },
             "monitoring": {
                 "check_interval_minutes": 30,
-                "enabled": True
+                "search_days": None,  # Only search emails received in the last N days (None - no date limit)
+                "enabled": True,
+                "use_idle": True,  # Wake up on new mail via IMAP IDLE instead of only polling
+                "prefilter_by_email_price": False,  # Skip page loads of listings over max_price (DB gets card data only)
+                "page_workers": 3  # Max OneHome pages loaded in parallel
             }
         }
 
     def connect_to_email(self) -> bool:
         """Connect to email server via IMAP"""
         try:
-            # Connect to server
-            self.imap = imaplib.IMAP4_SSL(
-                self.config['email']['server'],
-                self.config['email']['port']
-            )
-
-            # Login
-            self.imap.login(
-                self.config['email']['username'],
-                self.config['email']['password']
-            )
+            # Reuse the logged-in connection if we already have one
+            self.imap = get_imap(self.config['email'])
 
-            # Select folder
-            self.imap.select(self.config['email']['folder'])
+            # Select folder (every time - it refreshes the UIDVALIDITY response)
+            try:
+                self.imap.select(self.config['email']['folder'])
+            except (imaplib.IMAP4.abort, OSError):
+                # Connection died between the liveness check and SELECT
+                _CONN_CACHE.pop((self.config['email']['server'], self.config['email']['username']), None)
+                self.imap = get_imap(self.config['email'])
+                self.imap.select(self.config['email']['folder'])
 
             logger.info("Successfully connected to email server")
             return True
@@ -106,59 +259,22 @@ class EmailMonitor:
         """Extract land listing information from email body"""
         listing = {}
 
-        # Common patterns in land listing emails
-        patterns = {
-            'price': [
-                r'\$([0-9,]+)',
-                r'Price:\s*\$([0-9,]+)',
-                r'Asking:\s*\$([0-9,]+)',
-                r'Listed at:\s*\$([0-9,]+)'
-            ],
-            'acres': [
-                r'(\d+\.?\d*)\s*acres?',
-                r'(\d+\.?\d*)\s*ac\b',
-                r'Lot Size:\s*(\d+\.?\d*)\s*acres?'
-            ],
-            'sqft': [
-                r'(\d+,?\d*)\s*sq\.?\s*ft',
-                r'(\d+,?\d*)\s*square feet',
-                r'Lot Size:\s*(\d+,?\d*)\s*sq'
-            ],
-            'address': [
-                r'(?:Address|Location|Property):\s*(.+?)(?:\n|$)',
-                r'(\d+\s+[\w\s]+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Circle|Ct|Court))',
-            ],
-            'city': [
-                r'(?:City|Location):\s*(\w+)',
-                r',\s*(\w+)\s*,?\s*NC',
-                r'in\s+(\w+),?\s*NC'
-            ],
-            'mls': [
-                r'MLS\s*#?\s*(\w+)',
-                r'Listing\s*#?\s*(\w+)',
-                r'ID:\s*(\w+)'
-            ]
-        }
-
         # Extract information using patterns
-        for field, field_patterns in patterns.items():
-            for pattern in field_patterns:
-                match = re.search(pattern, email_body, re.IGNORECASE)
-                if match:
-                    value = match.group(1)
-
-                    # Clean up the value
-                    if field in ['price', 'sqft']:
-                        value = value.replace(',', '')
-                        listing[field] = float(value)
-                    elif field == 'acres':
-                        listing[field] = float(value)
-                        # Convert to sqft if not already present
-                        if 'sqft' not in listing:
-                            listing['sqft'] = listing[field] * 43560
-                    else:
-                        listing[field] = value.strip()
-                    break
+        matches = _scan_fields(email_body, ('price', 'acres', 'sqft', 'address', 'city', 'mls'))
+        for field, match in matches.items():
+            value = match.group(1)
+
+            # Clean up the value
+            if field in ['price', 'sqft']:
+                value = value.replace(',', '')
+                listing[field] = float(value)
+            elif field == 'acres':
+                listing[field] = float(value)
+                # Convert to sqft if not already present
+                if 'sqft' not in listing:
+                    listing['sqft'] = listing[field] * 43560
+            else:
+                listing[field] = value.strip()
 
         # Validate required fields
         if 'price' in listing and ('acres' in listing or 'sqft' in listing):
@@ -240,10 +356,15 @@ class EmailMonitor:
             if 'NC' not in full_address and 'North Carolina' not in full_address:
                 full_address += ', NC, USA'
 
+            if full_address in self._geocode_cache:
+                return self._geocode_cache[full_address]
+
             # Use Nominatim (OpenStreetMap)
             url = f"https://nominatim.openstreetmap.org/search?q={quote(full_address)}&format=json&limit=1"
             headers = {'User-Agent': 'AshevilleLandAnalyzer/1.0'}
 
+            # Respect Nominatim rate limits (shared across all callers)
+            nominatim_limiter.acquire()
             response = requests.get(url, headers=headers, timeout=10)
             response.raise_for_status()
 
@@ -253,6 +374,7 @@ class EmailMonitor:
                 lat = float(results[0]['lat'])
                 lon = float(results[0]['lon'])
                 logger.info(f"Geocoded: {address} -> ({lat}, {lon})")
+                self._geocode_cache[full_address] = (lat, lon)
                 return (lat, lon)
             else:
                 logger.warning(f"No results for: {address}")
@@ -265,44 +387,114 @@ class EmailMonitor:
     def extract_onehome_links(self, html_body: str) -> List[str]:
         """Extract OneHome listing links from HTML email"""
         try:
-            # Look for /listing? links (single property, not properties list)
-            pattern = r'https://portal\.onehome\.com/[^\s<>"\']+/listing\?[^\s<>"\']+'
-            matches = re.findall(pattern, html_body)
-
             # Remove duplicates while preserving order
-            seen = set()
-            unique_links = []
-            for link in matches:
-                if link not in seen:
-                    seen.add(link)
-                    unique_links.append(link)
-
-            return unique_links
+            return list(dict.fromkeys(_ONEHOME_RE.findall(html_body)))
         except Exception as e:
             logger.error(f"Error extracting links: {e}")
             return []
 
-    def parse_onehome_page(self, url: str) -> Optional[Dict]:
-        """Parse OneHome property page to extract: acres, price, address"""
+    def extract_email_cards(self, html_body: str) -> Dict[str, Dict]:
+        """Read price/address/city/MLS from the email's listing cards - returns {link: card}"""
+        cards = {}
+        for link, card_html in _EMAIL_CARD_RE.findall(html_body):
+            card = {}
+            for field, pattern in _CARD_FIELD_PATTERNS.items():
+                match = pattern.search(card_html)
+                if match:
+                    card[field] = match.group(1)
+            if 'price' in card:
+                card['price'] = float(card['price'].replace(',', ''))
+            cards.setdefault(link, card)
+        return cards
+
+    def create_driver(self):
+        """Create a headless Chrome driver for loading OneHome pages"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        # Set up Chrome options for headless mode
+        chrome_options = Options()
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+
+        return webdriver.Chrome(options=chrome_options)
+
+    def get_page_workers(self) -> int:
+        """Number of OneHome pages to load in parallel (kept small for site politeness)"""
+        return max(1, int(self.config.get('monitoring', {}).get('page_workers', 3)))
+
+    def get_driver_pool(self) -> queue.Queue:
+        """Get the shared driver pool, filling it with headless drivers on first use"""
+        with self._driver_pool_lock:
+            if self._driver_pool is None:
+                workers = self.get_page_workers()
+                pool = queue.Queue(maxsize=workers)
+                try:
+                    for _ in range(workers):
+                        pool.put(self.create_driver())
+                except Exception:
+                    # Don't leak the Chrome processes that did start
+                    while not pool.empty():
+                        try:
+                            pool.get_nowait().quit()
+                        except Exception as e:
+                            logger.debug(f"Error closing driver: {e}")
+                    raise
+                self._driver_pool = pool
+            return self._driver_pool
+
+    def get_page_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the shared page-loading executor
+
+        Emails are processed in parallel too, so every email's pages go through this
+        one pool instead of each email starting its own (K emails x K page threads)
+        """
+        with self._driver_pool_lock:
+            if self._page_executor is None:
+                self._page_executor = ThreadPoolExecutor(
+                    max_workers=self.get_page_workers(), thread_name_prefix='onehome-page'
+                )
+            return self._page_executor
+
+    def close_drivers(self):
+        """Quit all pooled Chrome drivers and stop the page-loading threads"""
+        if self._page_executor is not None:
+            self._page_executor.shutdown(wait=True)
+            self._page_executor = None
+
+        if self._driver_pool is None:
+            return
+
+        while not self._driver_pool.empty():
+            driver = self._driver_pool.get_nowait()
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error closing driver: {e}")
+
+        self._driver_pool = None
+
+    def parse_onehome_page(self, url: str, driver=None) -> Optional[Dict]:
+        """
+        Parse OneHome property page to extract: acres, price, address
+
+        If no driver is given, a temporary one is created and quit afterwards.
+        """
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
             from selenium.webdriver.common.by import By
             from selenium.webdriver.support.ui import WebDriverWait
             from selenium.webdriver.support import expected_conditions as EC
             from bs4 import BeautifulSoup
 
-            # Set up Chrome options for headless mode
-            chrome_options = Options()
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-
-            # Create driver
-            driver = webdriver.Chrome(options=chrome_options)
+            # Create driver if not borrowed from the pool
+            owns_driver = driver is None
+            if owns_driver:
+                driver = self.create_driver()
 
             try:
                 # Load page
@@ -319,36 +511,26 @@ class EmailMonitor:
                 page_source = driver.page_source
 
             finally:
-                driver.quit()
+                if owns_driver:
+                    driver.quit()
 
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'lxml')
 
             listing = {}
 
-            # Extract price - look for dollar amounts and take the largest one (most likely the listing price)
-            price_patterns = [
-                r'List Price:\s*\$([0-9,]+)',
-                r'Price:\s*\$([0-9,]+)',
-                r'Asking:\s*\$([0-9,]+)',
-                r'\$([0-9,]+)'
-            ]
-
             page_text = soup.get_text()
-            potential_prices = []
+            matches = _scan_fields(page_text, ('price', 'acres', 'address', 'mls'), _ONEHOME_FIELD_PATTERNS)
 
-            # Try specific patterns first
-            for pattern in price_patterns[:3]:
-                match = re.search(pattern, page_text)
-                if match:
-                    price_str = match.group(1).replace(',', '')
-                    listing['price'] = float(price_str)
-                    logger.info(f"Found price with pattern '{pattern}': ${listing['price']:,.0f}")
-                    break
+            # Extract price - try specific patterns first
+            if 'price' in matches:
+                price_str = matches['price'].group(1).replace(',', '')
+                listing['price'] = float(price_str)
+                logger.info(f"Found price with pattern '{matches['price'].re.pattern}': ${listing['price']:,.0f}")
 
-            # If no specific pattern matched, find all $ amounts and take the largest
+            # If no specific pattern matched, find all $ amounts and take the largest (most likely the listing price)
             if 'price' not in listing:
-                all_prices = re.findall(r'\$([0-9,]+)', page_text)
-                for price_str in all_prices:
+                potential_prices = []
+                for price_str in _ALL_PRICES_RE.findall(page_text):
                     price_val = float(price_str.replace(',', ''))
                     # Filter out unreasonable values (< $1000 are likely sqft prices, > $10M are unrealistic)
                     if 1000 <= price_val <= 10000000:
@@ -360,54 +542,26 @@ class EmailMonitor:
                     logger.info(f"Selected largest price from {len(potential_prices)} candidates: ${listing['price']:,.0f}")
 
             # Extract acres
-            acres_patterns = [
-                r'(\d+\.?\d*)\s*acres?',
-                r'(\d+\.?\d*)\s*ac\b',
-                r'Lot Size:\s*(\d+\.?\d*)\s*acres?',
-                r'Acres:\s*(\d+\.?\d*)'
-            ]
-
-            for pattern in acres_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    listing['acres'] = float(match.group(1))
-                    listing['sqft'] = listing['acres'] * 43560
-                    break
+            if 'acres' in matches:
+                listing['acres'] = float(matches['acres'].group(1))
+                listing['sqft'] = listing['acres'] * 43560
 
             # Extract address - look for structured data or common patterns
-            address_patterns = [
-                r'(?:Address|Location|Property):\s*(.+?)(?:\n|,\s*NC)',
-                r'(\d+\s+[\w\s]+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Circle|Ct|Court|Blvd|Boulevard)[,\s]+[\w\s]+,\s*NC)',
-            ]
-
-            for pattern in address_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    address = match.group(1).strip()
+            if 'address' in matches:
+                address = matches['address'].group(1).strip()
 
-                    # Clean up address - remove excessive whitespace and newlines
-                    address = re.sub(r'\s+', ' ', address)  # Replace multiple spaces/newlines with single space
-                    listing['address'] = address
+                # Clean up address - remove excessive whitespace and newlines
+                address = _WHITESPACE_RE.sub(' ', address)  # Replace multiple spaces/newlines with single space
+                listing['address'] = address
 
-                    # Extract city from address
-                    city_match = re.search(r',\s*(\w+)\s*,?\s*NC', address)
-                    if city_match:
-                        listing['city'] = city_match.group(1)
-                    break
+                # Extract city from address
+                city_match = _ADDRESS_CITY_RE.search(address)
+                if city_match:
+                    listing['city'] = city_match.group(1)
 
             # Extract MLS number
-            mls_patterns = [
-                r'MLS\s*#?\s*[:.]?\s*([A-Z0-9\-]+)',
-                r'MLS Number:\s*([A-Z0-9\-]+)',
-                r'Listing\s*#?\s*[:.]?\s*([A-Z0-9\-]+)',
-                r'ID:\s*([A-Z0-9\-]+)'
-            ]
-
-            for pattern in mls_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    listing['mls'] = match.group(1)
-                    break
+            if 'mls' in matches:
+                listing['mls'] = matches['mls'].group(1)
 
             # If we got the minimum required fields
             if 'price' in listing and 'acres' in listing:
@@ -424,25 +578,61 @@ class EmailMonitor:
             logger.error(f"Error parsing OneHome page: {e}")
             return None
 
-    def process_email(self, msg_id: str) -> List[Dict]:
+    def parse_onehome_pages(self, links: List[str]) -> List[Optional[Dict]]:
+        """Parse several OneHome pages concurrently using the shared driver pool"""
+        pool = self.get_driver_pool()
+
+        def worker(link: str) -> Optional[Dict]:
+            logger.info(f"Processing listing: {link[:80]}...")
+            driver = pool.get()
+            try:
+                return self.parse_onehome_page(link, driver=driver)
+            finally:
+                pool.put(driver)
+
+        results = [None] * len(links)
+        executor = self.get_page_executor()
+        futures = {executor.submit(worker, link): i for i, link in enumerate(links)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+        return results
+
+    def fetch_emails(self, uids: List[bytes]) -> Dict[bytes, bytes]:
+        """Fetch several emails by UID with one IMAP command - returns {uid: raw_email}"""
+        if not uids:
+            return {}
+
+        typ, data = self.imap.uid('FETCH', b','.join(uids), '(RFC822)')
+
+        raw_emails = {}
+        for item in data:
+            # Response is a list of (envelope, raw_email) tuples separated by b')'
+            if isinstance(item, tuple):
+                match = _FETCH_UID_RE.search(item[0])
+                if match:
+                    raw_emails[match.group(1)] = item[1]
+
+        return raw_emails
+
+    def process_email(self, msg_id: str, raw_email: bytes = None) -> List[Dict]:
         """Process a single email message - returns list of listings"""
         listings = []
 
         try:
-            # Fetch email
-            typ, data = self.imap.fetch(msg_id, '(RFC822)')
-            raw_email = data[0][1]
+            # Fetch email unless it was already fetched in a batch
+            if raw_email is None:
+                typ, data = self.imap.uid('FETCH', msg_id, '(RFC822)')
+                raw_email = data[0][1]
 
-            # Parse email
-            msg = email.message_from_bytes(raw_email)
+            # Parse email (the default policy decodes RFC 2047 headers for us)
+            msg = BytesParser(policy=email_default).parsebytes(raw_email)
 
             # Get subject
-            subject = decode_header(msg["Subject"])[0][0]
-            if isinstance(subject, bytes):
-                subject = subject.decode()
+            subject = str(msg["Subject"] or '')
 
             # Get date
-            date = msg["Date"]
+            date = str(msg["Date"]) if msg["Date"] else None
 
             # Get HTML body
             html_body = None
@@ -467,29 +657,40 @@ class EmailMonitor:
 
             logger.info(f"Found {len(onehome_links)} listing link(s) in email")
 
-            # Parse each listing
-            for link in onehome_links:
-                logger.info(f"Processing listing: {link[:80]}...")
-
-                # Parse the OneHome page
-                listing = self.parse_onehome_page(link)
+            # Optional: listings whose email card price already fails the price filter skip the page
+            # load (and geocoding) and only carry what the card shows - no acres, sqft or coordinates.
+            # Off by default so the monitor stores full page data; save_to_database never overwrites
+            # an existing MLS record with a card-only listing
+            card_listings = {}
+            if self.config['monitoring'].get('prefilter_by_email_price', False):
+                max_price = self.config['filters']['max_price']
+                for link, card in self.extract_email_cards(html_body).items():
+                    if card.get('price', 0) > max_price:
+                        card_listings[link] = card
+                if card_listings:
+                    logger.info(f"Skipping {len(card_listings)} page(s) over max price by email card")
+
+            # Parse the remaining OneHome pages in parallel
+            page_links = [link for link in onehome_links if link not in card_listings]
+            parsed = dict(zip(page_links, self.parse_onehome_pages(page_links)))
 
+            for link in onehome_links:
+                from_card = link in card_listings
+                listing = dict(card_listings[link]) if from_card else parsed.get(link)
                 if listing:
                     listing['email_subject'] = subject
                     listing['email_date'] = date
                     listing['email_id'] = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
                     listing['source_url'] = link
 
-                    # Try to geocode address
-                    if listing.get('address'):
+                    # Try to geocode address (not worth a Nominatim call for a rejected listing)
+                    if listing.get('address') and not from_card:
                         coords = self.geocode_address(
                             listing['address'],
                             listing.get('city', 'Asheville')
                         )
                         if coords:
                             listing['lat'], listing['lng'] = coords
-                            # Add slight delay to respect Nominatim rate limits
-                            time.sleep(1)
 
                     logger.info(f"Parsed listing: {listing.get('address', 'Unknown')}")
                     listings.append(listing)
@@ -550,18 +751,173 @@ class EmailMonitor:
 
         return True, "\n".join(reasons)
 
-    def load_processed_emails(self):
-        """Load list of already processed email IDs"""
+    def load_state(self):
+        """Load last processed UID from state file"""
         try:
-            with open('processed_emails.json', 'r') as f:
-                self.processed_emails = set(json.load(f))
+            with open(STATE_FILE, 'r') as f:
+                state = json.load(f)
+            self.last_uid = state.get('last_uid', 0)
+            self.uid_validity = state.get('uid_validity')
         except FileNotFoundError:
-            self.processed_emails = set()
+            self.last_uid = 0
+            self.uid_validity = None
+
+    def save_state(self):
+        """Save last processed UID to state file"""
+        with open(STATE_FILE, 'w') as f:
+            json.dump({'last_uid': self.last_uid, 'uid_validity': self.uid_validity}, f)
+
+    def search_new_uids(self) -> List[bytes]:
+        """Search UIDs of unread matching emails newer than the last processed one"""
+        # UIDs are only comparable within the same UIDVALIDITY - start over if it changed
+        typ, data = self.imap.response('UIDVALIDITY')
+        uid_validity = int(data[0]) if data and data[0] else None
+        if self.uid_validity is None:
+            # First run with UID state - don't re-process mail handled before it
+            self.last_uid = self.initial_last_uid()
+            self.uid_validity = uid_validity
+        elif uid_validity != self.uid_validity:
+            self.last_uid = 0
+            self.uid_validity = uid_validity
+
+        search_criteria = self.config['email'].get('search_criteria', 'ALL')
+        search = f'UID {self.last_uid + 1}:* UNSEEN {search_criteria}'
+
+        search_days = self.config['monitoring'].get('search_days')
+        if search_days:
+            since = (datetime.now() - timedelta(days=search_days)).strftime('%d-%b-%Y')
+            search += f' SINCE {since}'
+
+        typ, data = self.imap.uid('SEARCH', None, f'({search})')
+
+        # "N:*" always matches the newest message, even if its UID is below N
+        return [uid for uid in data[0].split() if int(uid) > self.last_uid]
+
+    def initial_last_uid(self) -> int:
+        """
+        UID to start from when there is no saved UID state yet
+
+        Migrates the processed message list of earlier versions (sequence numbers -
+        mapped to the UID of the newest one), otherwise starts after the newest message
+        in the mailbox.
+        """
+        try:
+            with open(LEGACY_STATE_FILE, 'r') as f:
+                processed = [int(msg_id) for msg_id in json.load(f)]
+        except (FileNotFoundError, ValueError):
+            processed = []
+
+        if processed:
+            try:
+                typ, data = self.imap.fetch(str(max(processed)), '(UID)')
+            except imaplib.IMAP4.error:
+                typ, data = 'NO', None  # Message no longer exists
+            match = _FETCH_UID_RE.search(data[0]) if typ == 'OK' and data and data[0] else None
+            if match:
+                logger.info(f"Migrated {len(processed)} processed emails from {LEGACY_STATE_FILE}")
+                return int(match.group(1))
+
+        # No usable legacy state - only mail arriving from now on
+        typ, data = self.imap.uid('SEARCH', None, '*')
+        uids = data[0].split() if typ == 'OK' and data and data[0] else []
+        return int(uids[-1]) if uids else 0
+
+    def wait_for_new_mail(self, timeout: float) -> bool:
+        """
+        Wait until the server reports a mailbox change (IMAP IDLE) or timeout expires
+
+        Falls back to a plain sleep if IDLE is disabled, unsupported or the connection fails.
+        Returns True if the server pushed an update before the timeout.
+        """
+        if (not self.config['monitoring'].get('use_idle', True)
+                or not self.imap or 'IDLE' not in self.imap.capabilities):
+            time.sleep(timeout)
+            return False
+
+        deadline = time.monotonic() + timeout
+        try:
+            changed = False
+            while not changed and time.monotonic() < deadline:
+                # One IDLE command lasts at most IMAP_IDLE_MAX_SECONDS
+                changed = self._idle(min(deadline - time.monotonic(), IMAP_IDLE_MAX_SECONDS))
+            return changed
+
+        except (imaplib.IMAP4.error, OSError) as e:
+            logger.warning(f"IMAP IDLE failed ({e}), falling back to polling")
+            _CONN_CACHE.pop((self.config['email']['server'], self.config['email']['username']), None)
+            self.imap = None
+            time.sleep(max(0, deadline - time.monotonic()))
+            return False
+
+    def _imap_data_ready(self) -> bool:
+        """
+        True if response bytes are already waiting to be read without blocking
+
+        Looks at imaplib's buffered reader and the TLS layer, not just the socket:
+        the server may send "+ idling" and "* N EXISTS" in one segment, and the
+        first readline() then buffers both lines while the socket looks idle.
+        """
+        imap = self.imap
+        if imap.sock.pending():
+            return True
+
+        # Non-blocking peek returns buffered bytes or whatever the socket has right now
+        timeout = imap.sock.gettimeout()
+        imap.sock.setblocking(False)
+        try:
+            return bool(imap.file.peek(1))
+        except (ssl.SSLWantReadError, BlockingIOError):
+            return False
+        finally:
+            imap.sock.settimeout(timeout)
+
+    def _idle(self, timeout: float) -> bool:
+        """Run one IDLE command; True if an untagged update (new mail, expunge...) arrived"""
+        imap = self.imap
 
-    def save_processed_emails(self):
-        """Save list of processed email IDs"""
-        with open('processed_emails.json', 'w') as f:
-            json.dump(list(self.processed_emails), f)
+        # Own tag namespace - imaplib's tags are uppercase letters, so lowercase can't collide
+        self._idle_count += 1
+        tag = b'idle%d' % self._idle_count
+        imap.send(tag + b' IDLE\r\n')
+
+        line = imap.readline()
+        if not line.startswith(b'+'):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+
+        changed = False
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                # Wait on the socket only when nothing is buffered - a timed-out read
+                # would break imaplib's reader
+                if not self._imap_data_ready():
+                    readable, _, _ = select.select([imap.sock], [], [], remaining)
+                    if not readable:
+                        break
+
+                line = imap.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed during IDLE")
+
+                # "* OK Still here" keepalives don't mean anything changed
+                if line.startswith(b'* ') and not line.startswith(b'* OK'):
+                    changed = True
+                    break
+        finally:
+            # End IDLE and drain everything up to the tagged completion
+            imap.send(b'DONE\r\n')
+            while True:
+                line = imap.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed after IDLE")
+                if line.startswith(tag):
+                    break
+
+        return changed
 
     def save_to_database(self, listing: Dict) -> bool:
         """Save listing to database"""
@@ -612,51 +968,53 @@ class EmailMonitor:
             return alerts
 
         try:
-            # Search for emails matching criteria
-            search_criteria = self.config['email'].get('search_criteria', 'ALL')
+            # Search only emails newer than the last processed one
+            new_uids = self.search_new_uids()
+            logger.info(f"Found {len(new_uids)} new unread emails matching criteria")
 
-            # Search for unread emails
-            typ, data = self.imap.search(None, f'(UNSEEN {search_criteria})')
+            # Fetch all new emails in one round trip
+            raw_emails = self.fetch_emails(new_uids)
 
-            email_ids = data[0].split()
-            logger.info(f"Found {len(email_ids)} unread emails matching criteria")
-
-            for msg_id in email_ids:
-                # Skip if already processed
-                msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
-                if msg_id_str in self.processed_emails:
-                    continue
-
-                # Process email - returns list of listings
-                listings = self.process_email(msg_id)
-
-                # Process each listing from the email
-                for listing in listings:
-                    # Save ALL listings to database (even if they don't pass filters)
-                    self.save_to_database(listing)
-
-                    # Check if should alert
-                    should_alert, reason = self.should_alert(listing)
-
-                    if should_alert:
-                        listing['alert_reason'] = reason
-                        alerts.append(listing)
-                        logger.info(f"✓ Alert triggered: {listing.get('address', 'Unknown')} - {reason}")
-                    else:
-                        logger.info(f"○ Saved to DB (no alert): {listing.get('address', 'Unknown')} - {reason}")
+            fetched = []
+            for uid in new_uids:
+                if uid in raw_emails:
+                    fetched.append(uid)
+                else:
+                    logger.warning(f"Email UID {uid.decode()} was not returned by the server")
+
+            # Process emails concurrently (page loads are network-bound); map keeps UID order,
+            # so saving and last_uid updates below stay sequential
+            with ThreadPoolExecutor(max_workers=self.get_page_workers()) as executor:
+                parsed = executor.map(lambda uid: self.process_email(uid, raw_emails[uid]), fetched)
+
+                for uid, listings in zip(fetched, parsed):
+                    # Process each listing from the email
+                    for listing in listings:
+                        # Save ALL listings to database (even if they don't pass filters)
+                        self.save_to_database(listing)
+
+                        # Check if should alert
+                        should_alert, reason = self.should_alert(listing)
+
+                        if should_alert:
+                            listing['alert_reason'] = reason
+                            alerts.append(listing)
+                            logger.info(f"✓ Alert triggered: {listing.get('address', 'Unknown')} - {reason}")
+                        else:
+                            logger.info(f"○ Saved to DB (no alert): {listing.get('address', 'Unknown')} - {reason}")
 
-                # Mark email as processed
-                self.processed_emails.add(msg_id_str)
+                    # Mark email as processed
+                    self.last_uid = max(self.last_uid, int(uid))
 
-            # Save processed emails
-            self.save_processed_emails()
+            # Save mailbox position
+            self.save_state()
 
         except Exception as e:
             logger.error(f"Error checking emails: {e}")
 
         finally:
-            if self.imap:
-                self.imap.logout()
+            # The IMAP connection stays cached for the next check (logged out at exit)
+            self.close_drivers()
 
         return alerts
 
@@ -667,7 +1025,7 @@ class EmailMonitor:
         # Initialize Telegram notifier if enabled
         telegram_notifier = None
         if self.config['telegram'].get('enabled'):
-            from notifications.telegram_bot import TelegramNotifier
+            from notifications.telegram_bot import TelegramNotifier, AlertBatcher
             telegram_notifier = TelegramNotifier(
                 self.config['telegram']['bot_token'],
                 self.config['telegram']['chat_id']
@@ -680,25 +1038,30 @@ class EmailMonitor:
                 alerts = self.check_new_emails()
 
                 # Send alerts
-                for alert in alerts:
-                    logger.info(f"Processing alert for: {alert.get('address')}")
-
-                    # Send to Telegram if configured
-                    if telegram_notifier:
-                        success = telegram_notifier.send_land_alert(alert)
-                        if success:
-                            logger.info(f"✅ Telegram alert sent for: {alert.get('address')}")
-                        else:
-                            logger.error(f"❌ Failed to send Telegram alert")
+                if telegram_notifier and alerts:
+                    # Batch alerts into as few Telegram messages as possible
+                    batcher = AlertBatcher(telegram_notifier)
+                    for alert in alerts:
+                        logger.info(f"Processing alert for: {alert.get('address')}")
+                        batcher.add(alert)
+
+                    if batcher.flush():
+                        logger.info(f"✅ Telegram alerts sent: {len(alerts)}")
                     else:
+                        logger.error(f"❌ Failed to send Telegram alert")
+                else:
+                    for alert in alerts:
+                        logger.info(f"Processing alert for: {alert.get('address')}")
+
                         # Just log the alert
                         message = self.format_alert_message(alert)
                         logger.info(f"ALERT: {message}")
 
-                # Wait before next check
+                # Wait before next check (returns early when new mail arrives)
                 interval = self.config['monitoring']['check_interval_minutes']
-                logger.info(f"Waiting {interval} minutes before next check...")
-                time.sleep(interval * 60)
+                logger.info(f"Waiting up to {interval} minutes for new mail...")
+                if self.wait_for_new_mail(interval * 60):
+                    logger.info("Mailbox changed, checking now")
 
             except KeyboardInterrupt:
                 logger.info("Stopping email monitor...")
@@ -707,6 +1070,9 @@ class EmailMonitor:
                 logger.error(f"Error in monitor loop: {e}")
                 time.sleep(60)  # Wait 1 minute before retrying
 
+        if telegram_notifier:
+            telegram_notifier.close()
+
     def format_alert_message(self, listing: Dict) -> str:
         """Format listing for alert message"""
         lines = [
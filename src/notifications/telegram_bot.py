@@ -2,13 +2,69 @@
 Telegram Bot for sending land opportunity alerts
 """
 
-import requests
-import json
+import asyncio
+import atexit
+import httpx
+import orjson
 import logging
-from typing import Dict, Optional
+import queue
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Timeouts and connection limits for Telegram API calls
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.05)
+CONNECTION_LIMITS = httpx.Limits(max_keepalive_connections=4, max_connections=16)
+
+# Payloads are pre-serialized with orjson, so the content type is set once per client
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Attempts per API call (retries on 429 and 5xx)
+MAX_ATTEMPTS = 3
+
+# Max alerts in flight at once for async batch sends
+MAX_CONCURRENT_SENDS = 25
+
+# Max location pins waiting for the background sender
+LOCATION_QUEUE_SIZE = 1000
+
+# Max seconds close() waits for queued location pins to be sent
+LOCATION_FLUSH_TIMEOUT = 10.0
+
+# Tells the location sender to stop
+_STOP = object()
+
+# Characters with special meaning in Telegram's (legacy) Markdown parse mode
+_MD_ESCAPE = re.compile(r'([_*`\[])')
+
+# Telegram allows ~30 messages/s per bot and ~1 message/s per chat
+_global_limiter = TokenBucket(rate=29, capacity=29)
+_chat_limiters = {}
+_chat_limiters_lock = threading.Lock()
+
+
+def _md_escape(value) -> str:
+    """Escape a user-facing value for Markdown messages"""
+    return _MD_ESCAPE.sub(r'\\\1', str(value))
+
+
+def _chat_limiter(chat_id: str) -> TokenBucket:
+    """Get the per-chat rate limiter"""
+    with _chat_limiters_lock:
+        if chat_id not in _chat_limiters:
+            _chat_limiters[chat_id] = TokenBucket(rate=1, capacity=1)
+        return _chat_limiters[chat_id]
+
 
 class TelegramNotifier:
     """Send notifications via Telegram Bot API"""
@@ -25,6 +81,139 @@ class TelegramNotifier:
         self.chat_id = chat_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
 
+        # HTTP/2 client: consecutive and concurrent calls share one TLS connection
+        self.client = httpx.Client(
+            http2=True,
+            base_url=self.api_url,
+            timeout=REQUEST_TIMEOUT,
+            limits=CONNECTION_LIMITS,
+            headers=JSON_HEADERS
+        )
+
+        # Client for the async API (opened by "async with")
+        self._async_client = None
+
+        # Location pins are sent by a background thread (started on the first pin)
+        # so alerts return right after the text
+        self._loc_queue = queue.Queue(maxsize=LOCATION_QUEUE_SIZE)
+        self._loc_thread = None
+        self._loc_lock = threading.Lock()
+        self._closed = False
+
+    def close(self):
+        """Flush pending location pins (up to LOCATION_FLUSH_TIMEOUT) and close the HTTP client"""
+        with self._loc_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._loc_thread
+
+        if thread is not None:
+            deadline = time.monotonic() + LOCATION_FLUSH_TIMEOUT
+            try:
+                self._loc_queue.put(_STOP, timeout=LOCATION_FLUSH_TIMEOUT)
+            except queue.Full:
+                pass
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.warning(f"Location pins not sent within {LOCATION_FLUSH_TIMEOUT}s, dropping them")
+
+        self.client.close()
+
+    def _location_worker(self):
+        """Send queued location pins one by one (rate limits apply as usual)"""
+        while True:
+            item = self._loc_queue.get()
+            if item is _STOP:
+                return
+            self.send_location(*item)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        self._async_client = httpx.AsyncClient(
+            http2=True,
+            base_url=self.api_url,
+            timeout=REQUEST_TIMEOUT,
+            limits=CONNECTION_LIMITS,
+            headers=JSON_HEADERS
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._async_client.aclose()
+        self._async_client = None
+
+    def _post(self, method: str, payload: Dict) -> httpx.Response:
+        """
+        Call a Bot API method within Telegram rate limits
+
+        Retries after Retry-After on HTTP 429 and with exponential backoff on 5xx.
+
+        Args:
+            method: Bot API method name (e.g. sendMessage)
+            payload: JSON payload
+
+        Returns:
+            Last HTTP response
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            _global_limiter.acquire()
+            _chat_limiter(payload['chat_id']).acquire()
+
+            response = self.client.post(f"/{method}", content=orjson.dumps(payload))
+
+            if attempt == MAX_ATTEMPTS - 1:
+                break
+
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                except ValueError:
+                    retry_after = 1
+                logger.warning(f"Telegram rate limit hit, retrying in {retry_after}s")
+                time.sleep(retry_after + 0.1)
+            elif response.status_code >= 500:
+                time.sleep(0.5 * 2 ** attempt)
+            else:
+                break
+
+        return response
+
+    async def _post_async(self, method: str, payload: Dict) -> httpx.Response:
+        """
+        Async version of _post (requires "async with notifier")
+
+        Returns:
+            Last HTTP response
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            await _global_limiter.acquire_async()
+            await _chat_limiter(payload['chat_id']).acquire_async()
+
+            response = await self._async_client.post(f"/{method}", content=orjson.dumps(payload))
+
+            if attempt == MAX_ATTEMPTS - 1:
+                break
+
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                except ValueError:
+                    retry_after = 1
+                logger.warning(f"Telegram rate limit hit, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after + 0.1)
+            elif response.status_code >= 500:
+                await asyncio.sleep(0.5 * 2 ** attempt)
+            else:
+                break
+
+        return response
+
     def send_message(self, text: str, parse_mode: str = "Markdown") -> bool:
         """
         Send text message to Telegram
@@ -37,14 +226,13 @@ class TelegramNotifier:
             True if successful, False otherwise
         """
         try:
-            url = f"{self.api_url}/sendMessage"
             payload = {
                 "chat_id": self.chat_id,
                 "text": text,
                 "parse_mode": parse_mode
             }
 
-            response = requests.post(url, json=payload)
+            response = self._post("sendMessage", payload)
 
             if response.status_code == 200:
                 logger.info("Telegram message sent successfully")
@@ -69,14 +257,13 @@ class TelegramNotifier:
             True if successful, False otherwise
         """
         try:
-            url = f"{self.api_url}/sendLocation"
             payload = {
                 "chat_id": self.chat_id,
                 "latitude": lat,
                 "longitude": lng
             }
 
-            response = requests.post(url, json=payload)
+            response = self._post("sendLocation", payload)
 
             if response.status_code == 200:
                 logger.info("Location sent successfully")
@@ -89,79 +276,327 @@ class TelegramNotifier:
             logger.error(f"Error sending location: {e}")
             return False
 
-    def send_land_alert(self, listing: Dict, zone_analysis: Dict = None) -> bool:
+    async def send_message_async(self, text: str, parse_mode: str = "Markdown", chat_id: str = None) -> bool:
+        """Async version of send_message (chat_id defaults to the notifier's chat)"""
+        try:
+            response = await self._post_async("sendMessage", {
+                "chat_id": chat_id or self.chat_id,
+                "text": text,
+                "parse_mode": parse_mode
+            })
+
+            if response.status_code == 200:
+                logger.info("Telegram message sent successfully")
+                return True
+            else:
+                logger.error(f"Failed to send Telegram message: {response.text}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Error sending Telegram message: {e}")
+            return False
+
+    async def send_location_async(self, lat: float, lng: float) -> bool:
+        """Async version of send_location"""
+        try:
+            response = await self._post_async("sendLocation", {
+                "chat_id": self.chat_id,
+                "latitude": lat,
+                "longitude": lng
+            })
+
+            if response.status_code == 200:
+                logger.info("Location sent successfully")
+                return True
+            else:
+                logger.error(f"Failed to send location: {response.text}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Error sending location: {e}")
+            return False
+
+    async def broadcast(self, chat_ids: List[str], text: str, parse_mode: str = "Markdown") -> List[Tuple[str, bool]]:
         """
-        Send formatted land opportunity alert
+        Send the same message to several chats concurrently
+
+        Per-chat rate limits still apply; waiting happens inside a semaphore slot.
 
         Args:
-            listing: Land listing details
-            zone_analysis: Optional zone analysis results
+            chat_ids: Chats to send to
+            text: Message text
+            parse_mode: Parse mode (Markdown or HTML)
 
         Returns:
-            True if successful, False otherwise
+            (chat_id, success) pairs so callers can retry failed chats
         """
-        # Format message
-        lines = [
-            "🚨 *NEW LAND OPPORTUNITY* 🚨",
-            "",
-            f"📍 *Location:* {listing.get('address', 'Unknown')}, {listing.get('city', 'Unknown')}",
-            f"💰 *Price:* ${listing.get('price', 0):,.0f}",
-            f"📏 *Size:* {listing.get('acres', 0):.2f} acres ({listing.get('sqft', 0):,.0f} sqft)",
-        ]
+        sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+
+        async def _bounded(chat_id: str) -> Tuple[str, bool]:
+            async with sem:
+                return chat_id, await self.send_message_async(text, parse_mode, chat_id=chat_id)
+
+        return list(await asyncio.gather(*[_bounded(chat_id) for chat_id in chat_ids]))
+
+    @staticmethod
+    def _emit_land_alert_lines(listing: Dict, zone_analysis: Dict = None):
+        """Yield the lines of a land alert, skipping fields that are missing"""
+        yield "🚨 *NEW LAND OPPORTUNITY* 🚨"
+        yield ""
+        yield f"📍 *Location:* {_md_escape(listing.get('address', 'Unknown'))}, {_md_escape(listing.get('city', 'Unknown'))}"
+        yield f"💰 *Price:* ${listing.get('price', 0):,.0f}"
+        yield f"📏 *Size:* {listing.get('acres', 0):.2f} acres ({listing.get('sqft', 0):,.0f} sqft)"
 
         # Add price per acre if available
         if listing.get('price_per_acre'):
-            lines.append(f"💵 *Price/Acre:* ${listing['price_per_acre']:,.0f}")
+            yield f"💵 *Price/Acre:* ${listing['price_per_acre']:,.0f}"
 
         # Add MLS number if available
         if listing.get('mls'):
-            lines.append(f"🏠 *MLS:* {listing['mls']}")
+            yield f"🏠 *MLS:* {_md_escape(listing['mls'])}"
 
         # Add URL if available
         if listing.get('source_url'):
-            lines.append(f"🔗 *Link:* {listing['source_url']}")
+            yield f"🔗 *Link:* {_md_escape(listing['source_url'])}"
 
         # Add zone analysis if available
         if zone_analysis and 'score' in zone_analysis:
-            lines.extend([
-                "",
-                f"📊 *Zone Analysis:*",
-                f"Score: {zone_analysis['score']}/100",
-                f"Green Zones: {zone_analysis['statistics'].get('green_zones_percent', 0):.0f}%",
-                f"Properties Analyzed: {zone_analysis['properties_analyzed']}",
-                "",
-                f"📈 *Recommendation:* {zone_analysis['recommendation']}"
-            ])
+            yield ""
+            yield "📊 *Zone Analysis:*"
+            yield f"Score: {zone_analysis['score']}/100"
+            yield f"Green Zones: {zone_analysis['statistics'].get('green_zones_percent', 0):.0f}%"
+            yield f"Properties Analyzed: {zone_analysis['properties_analyzed']}"
+            yield ""
+            yield f"📈 *Recommendation:* {_md_escape(zone_analysis['recommendation'])}"
 
         # Add alert reason if available
         if listing.get('alert_reason'):
-            lines.extend([
-                "",
-                f"✅ *Alert Triggered:* {listing['alert_reason']}"
-            ])
-
-        # Add MLS if available
-        if listing.get('mls'):
-            lines.append(f"🏠 *MLS:* {listing['mls']}")
+            yield ""
+            yield f"✅ *Alert Triggered:* {_md_escape(listing['alert_reason'])}"
 
         # Add source info
         if listing.get('email_subject'):
-            lines.extend([
-                "",
-                f"📧 *Source:* {listing['email_subject']}"
-            ])
+            yield ""
+            yield f"📧 *Source:* {_md_escape(listing['email_subject'])}"
+
+    def format_land_alert(self, listing: Dict, zone_analysis: Dict = None) -> str:
+        """
+        Format land opportunity alert text
+
+        Args:
+            listing: Land listing details
+            zone_analysis: Optional zone analysis results
+
+        Returns:
+            Markdown message text
+        """
+        return "\n".join(self._emit_land_alert_lines(listing, zone_analysis))
+
+    def send_land_alert(self, listing: Dict, zone_analysis: Dict = None) -> bool:
+        """
+        Send formatted land opportunity alert
 
-        message = "\n".join(lines)
+        Args:
+            listing: Land listing details
+            zone_analysis: Optional zone analysis results
 
+        Returns:
+            True if successful, False otherwise
+        """
         # Send text message
-        success = self.send_message(message)
+        success = self.send_message(self.format_land_alert(listing, zone_analysis))
 
-        # Send location if coordinates available
+        # Queue location pin if coordinates available (sent in the background)
         if success and listing.get('lat') and listing.get('lng'):
-            self.send_location(listing['lat'], listing['lng'])
+            self.queue_location(listing['lat'], listing['lng'])
 
         return success
 
+    def queue_location(self, lat: float, lng: float):
+        """Queue a location pin for the background sender (dropped if the queue is full or closed)"""
+        with self._loc_lock:
+            if self._closed:
+                logger.warning("Notifier is closed, dropping location pin")
+                return
+            if self._loc_thread is None:
+                self._loc_thread = threading.Thread(target=self._location_worker, daemon=True)
+                self._loc_thread.start()
+
+            try:
+                self._loc_queue.put_nowait((lat, lng))
+            except queue.Full:
+                logger.warning("Location queue is full, dropping location pin")
+
+    async def send_land_alert_async(self, listing: Dict, zone_analysis: Dict = None) -> bool:
+        """
+        Async version of send_land_alert
+
+        The text message and location pin are sent concurrently.
+        """
+        message = self.format_land_alert(listing, zone_analysis)
+
+        if listing.get('lat') and listing.get('lng'):
+            success, _ = await asyncio.gather(
+                self.send_message_async(message),
+                self.send_location_async(listing['lat'], listing['lng'])
+            )
+            return success
+
+        return await self.send_message_async(message)
+
+    async def send_many(self, listings: List[Dict]) -> List[bool]:
+        """
+        Send land alerts for several listings concurrently
+
+        Args:
+            listings: Land listing details
+
+        Returns:
+            Success flag for each listing
+        """
+        sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+
+        async def _bounded(listing: Dict) -> bool:
+            async with sem:
+                return await self.send_land_alert_async(listing)
+
+        return list(await asyncio.gather(*[_bounded(listing) for listing in listings]))
+
+
+class AlertBatcher:
+    """
+    Buffer land alerts and send them as combined messages
+
+    Alerts are flushed flush_interval seconds after the first one is added,
+    or as soon as the buffer exceeds max_chars. Use as a context manager to
+    guarantee a final flush.
+    """
+
+    SEPARATOR = "\n\n---\n\n"
+
+    def __init__(self, notifier: TelegramNotifier, flush_interval: float = 3.0, max_chars: int = 3500):
+        """
+        Initialize alert batcher
+
+        Args:
+            notifier: TelegramNotifier used for sending
+            flush_interval: Seconds to wait for more alerts before sending
+            max_chars: Max message length (Telegram limit is 4096, leave margin for Markdown)
+        """
+        self.notifier = notifier
+        self.flush_interval = flush_interval
+        self.max_chars = max_chars
+        self._buffer = []  # (text, listing) pairs
+        self._size = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._failed = False  # A size- or timer-triggered flush failed since the last flush() call
+
+    def add(self, listing: Dict, zone_analysis: Dict = None):
+        """Queue a land alert for the next flush"""
+        text = self.notifier.format_land_alert(listing, zone_analysis)
+
+        with self._lock:
+            self._buffer.append((text, listing))
+            self._size += len(text) + len(self.SEPARATOR)
+            flush_now = self._size >= self.max_chars
+
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            self._flush_in_background()
+
+    def _flush_in_background(self):
+        """Flush not requested by the caller - remember a failure for the next flush() result"""
+        if not self.flush():
+            with self._lock:
+                self._failed = True
+
+    def _slices(self, items: List) -> List[List]:
+        """Group buffered alerts so each joined message fits in max_chars"""
+        slices = []
+        current = []
+        size = 0
+
+        for text, listing in items:
+            added = len(text) + (len(self.SEPARATOR) if current else 0)
+            if current and size + added > self.max_chars:
+                slices.append(current)
+                current = []
+                added = len(text)
+                size = 0
+            current.append((text, listing))
+            size += added
+
+        if current:
+            slices.append(current)
+        return slices
+
+    def flush(self) -> bool:
+        """
+        Send all buffered alerts
+
+        Returns:
+            True if every message was sent successfully, including messages
+            sent by automatic flushes since the previous call
+        """
+        with self._lock:
+            items = self._buffer
+            self._buffer = []
+            self._size = 0
+            failed_before = self._failed
+            self._failed = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        success = True
+        for chunk in self._slices(items):
+            message = self.SEPARATOR.join(text for text, _ in chunk)
+            if not self.notifier.send_message(message):
+                success = False
+                continue
+
+            # Queue location pins for the alerts in this message (sent in the background)
+            for _, listing in chunk:
+                if listing.get('lat') and listing.get('lng'):
+                    self.notifier.queue_location(listing['lat'], listing['lng'])
+
+        return success and not failed_before
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+
+# (bot_token, chat_id) -> shared notifier
+_notifiers = {}
+_notifiers_lock = threading.Lock()
+
+
+def _get_notifier(bot_token: str, chat_id: str) -> TelegramNotifier:
+    """Get a shared notifier (and its connection pool) for a bot/chat pair"""
+    with _notifiers_lock:
+        notifier = _notifiers.get((bot_token, chat_id))
+        if notifier is None:
+            notifier = _notifiers[(bot_token, chat_id)] = TelegramNotifier(bot_token, chat_id)
+        return notifier
+
+
+@atexit.register
+def _close_notifiers():
+    """Close pooled sessions of cached notifiers on interpreter exit"""
+    with _notifiers_lock:
+        notifiers = list(_notifiers.values())
+        _notifiers.clear()
+    for notifier in notifiers:
+        notifier.close()
+
 
 def send_telegram_alert(message: str, config: Dict) -> bool:
     """
@@ -178,8 +613,7 @@ def send_telegram_alert(message: str, config: Dict) -> bool:
         logger.warning("Telegram not configured")
         return False
 
-    notifier = TelegramNotifier(config['bot_token'], config['chat_id'])
-    return notifier.send_message(message)
+    return _get_notifier(config['bot_token'], config['chat_id']).send_message(message)
 
 
 if __name__ == "__main__":
@@ -223,6 +657,7 @@ if __name__ == "__main__":
 
     print("Sending test alert to Telegram...")
     success = notifier.send_land_alert(test_listing, test_zone_analysis)
+    notifier.close()
 
     if success:
         print("✅ Test alert sent successfully!")
@@ -0,0 +1,34 @@
+"""
+Скрипт для создания индексов, добавленных в модели после создания таблиц
+"""
+
+import sys
+import os
+
+# Добавляем родительскую директорию в path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.database import Base, engine
+
+
+def add_missing_indexes():
+    """
+    Создает все индексы из моделей, которых еще нет в базе
+    create_all не трогает существующие таблицы, поэтому новые индексы создаются здесь
+    Наличие индекса проверяется через checkfirst (аналог CREATE INDEX IF NOT EXISTS)
+    """
+    try:
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in sorted(table.indexes, key=lambda idx: idx.name):
+                    print(f"Creating index {index.name} on {table.name}...")
+                    index.create(bind=conn, checkfirst=True)
+
+        print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"ERROR creating indexes: {e}")
+
+
+if __name__ == '__main__':
+    add_missing_indexes()
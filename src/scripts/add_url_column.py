@@ -8,58 +8,37 @@ import os
 # Добавляем родительскую директорию в path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import text
-from data.database import engine, get_session
+from sqlalchemy import inspect
+from data.database import engine
+
+# Таблицы, в которые нужно добавить колонку url
+URL_COLUMN_TABLES = ['properties', 'land_opportunities']
 
 
 def add_url_columns():
     """
     Добавляет колонку url в таблицы properties и land_opportunities
+    Наличие колонки проверяется через inspect, все ALTER выполняются в одной транзакции
     """
-    session = get_session()
-
     try:
-        print("Adding url column to properties table...")
+        inspector = inspect(engine)
 
-        # Пробуем добавить колонку (если уже существует, получим ошибку)
-        try:
-            alter_query = text("""
-                ALTER TABLE properties
-                ADD COLUMN url VARCHAR(500)
-            """)
-            session.execute(alter_query)
-            session.commit()
-            print("SUCCESS: Column url added to properties table")
-        except Exception as e:
-            if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
-                print("Column url already exists in properties table")
-            else:
-                raise
+        with engine.begin() as conn:
+            for table in URL_COLUMN_TABLES:
+                print(f"Adding url column to {table} table...")
 
-        print("\nAdding url column to land_opportunities table...")
+                columns = {col['name'] for col in inspector.get_columns(table)}
+                if 'url' in columns:
+                    print(f"Column url already exists in {table} table")
+                    continue
 
-        # Пробуем добавить колонку (если уже существует, получим ошибку)
-        try:
-            alter_query = text("""
-                ALTER TABLE land_opportunities
-                ADD COLUMN url VARCHAR(500)
-            """)
-            session.execute(alter_query)
-            session.commit()
-            print("SUCCESS: Column url added to land_opportunities table")
-        except Exception as e:
-            if "duplicate column name" in str(e).lower() or "already exists" in str(e).lower():
-                print("Column url already exists in land_opportunities table")
-            else:
-                raise
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN url VARCHAR(500)")
+                print(f"SUCCESS: Column url added to {table} table")
 
         print("\nMigration completed successfully!")
 
     except Exception as e:
         print(f"ERROR adding columns: {e}")
-        session.rollback()
-    finally:
-        session.close()
 
 
 if __name__ == '__main__':
@@ -9,8 +9,8 @@ import argparse
 
 # Установить UTF-8 кодировку для вывода в консоль
 if sys.platform == "win32":
-    import codecs
-    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stderr.reconfigure(encoding="utf-8")
 
 # Добавляем родительскую директорию в path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
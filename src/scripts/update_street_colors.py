@@ -5,6 +5,7 @@ CLI скрипт для обновления анализа улиц и цвет
 
 import sys
 import os
+from collections import Counter
 from datetime import datetime
 
 # Добавляем родительскую директорию в path
@@ -28,7 +29,7 @@ def main():
     try:
         results = analyze_all_streets()
 
-        # Подсчитать статистику по цветам
+        # Подсчитать статистику по цветам улиц, обработанных в этом запуске
         if results:
             color_counts = {
                 'green': 0,
@@ -36,9 +37,7 @@ def main():
                 'yellow': 0,
                 'red': 0
             }
-
-            for analysis in results:
-                color_counts[analysis.color] += 1
+            color_counts.update(Counter(analysis.color for analysis in results))
 
             total = len(results)
 
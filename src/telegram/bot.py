@@ -5,6 +5,11 @@
 
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes
+from sqlalchemy.orm import joinedload
+from typing import Optional
+from collections import defaultdict
+import asyncio
+import time
 import sys
 import os
 
@@ -15,6 +20,41 @@ from config import TELEGRAM_BOT_TOKEN
 from data.database import Property, LandOpportunity, get_session
 from analyzers.price_calculator import format_currency
 
+# Время жизни кеша ответа /top (секунды)
+TOP_CACHE_TTL = 20
+
+# Кеш ответа /top: (текст сообщения, время истечения по time.monotonic)
+_top_cache = None
+_top_lock = asyncio.Lock()
+
+# Emoji и заголовок уведомления по urgency_level (остальные уровни - обычный участок)
+_URGENCY = {
+    'urgent': ('🔥 СРОЧНО!', 'НОВЫЙ СРОЧНЫЙ УЧАСТОК'),
+    'good': ('⭐', 'НОВАЯ ХОРОШАЯ ВОЗМОЖНОСТЬ'),
+    None: ('✅', 'НОВЫЙ УЧАСТОК')
+}
+
+# Emoji для списка /top по urgency_level
+_TOP_EMOJI = {'urgent': '🔥', 'good': '⭐'}
+
+# Шаблон уведомления о новом участке
+# Необязательные строки (*_line) пустые если данных нет
+_ALERT_TEMPLATE = (
+    "{emoji} {title}\n\n"
+    "📊 Urgency Score: {score}/100\n\n"
+    "📍 Адрес: {address}\n"
+    "🏙️ Город: {city}, {state} {zip}\n\n"
+    "💰 Цена: {price_str}\n"
+    "{lot_size_line}"
+    "{price_per_acre_line}"
+    "{mls_line}"
+    "{url_line}"
+    "\n🟢 Зона: {zone}\n"
+    "📈 Рынок: {market}\n"
+    "🏘️ Средняя цена района: ${nearby_avg_price_sqft:.2f}/sqft\n"
+    "📊 Продаж рядом: {nearby_sales_count}"
+)
+
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -72,31 +112,31 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     await update.message.reply_text(help_message)
 
 
-async def top_lands_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+def build_top_message() -> Optional[str]:
     """
-    Обрабатывает команду /top - показывает топ-5 участков
+    Формирует текст ответа /top - топ-5 участков
 
-    Args:
-        update: Telegram Update объект
-        context: Telegram Context объект
+    Returns:
+        Текст сообщения или None если участков нет
     """
     session = get_session()
     try:
-        # Получить топ-5 по urgency_score
-        top_opportunities = session.query(LandOpportunity).order_by(
+        # Получить топ-5 по urgency_score вместе с домами (один запрос)
+        top_opportunities = session.query(LandOpportunity).options(
+            joinedload(LandOpportunity.property)
+        ).order_by(
             LandOpportunity.urgency_score.desc()
         ).limit(5).all()
 
         if not top_opportunities:
-            await update.message.reply_text("Пока нет земельных участков в базе данных.")
-            return
+            return None
 
         # Сформировать сообщение
         message = "🔥 ТОП-5 ЗЕМЕЛЬНЫХ УЧАСТКОВ:\n\n"
 
         for idx, opp in enumerate(top_opportunities, 1):
-            # Получить связанный Property
-            prop = session.query(Property).filter_by(id=opp.property_id).first()
+            # Связанный Property (уже загружен через joinedload)
+            prop = opp.property
 
             if not prop:
                 continue
@@ -106,12 +146,7 @@ async def top_lands_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             price_str = format_currency(price) if price else 'N/A'
 
             # Emoji для urgency
-            if opp.urgency_level == 'urgent':
-                emoji = '🔥'
-            elif opp.urgency_level == 'good':
-                emoji = '⭐'
-            else:
-                emoji = '✅'
+            emoji = _TOP_EMOJI.get(opp.urgency_level, '✅')
 
             # Добавить в сообщение
             message += f"{idx}. {emoji} Score: {opp.urgency_score}/100\n"
@@ -123,12 +158,35 @@ async def top_lands_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
             message += f"\n   🟢 {opp.zone_color} zone | 📊 {opp.market_status}\n\n"
 
-        await update.message.reply_text(message)
+        return message
 
     finally:
         session.close()
 
 
+async def top_lands_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Обрабатывает команду /top - показывает топ-5 участков
+    Ответ кешируется на TOP_CACHE_TTL секунд, одновременные запросы ждут один SELECT
+
+    Args:
+        update: Telegram Update объект
+        context: Telegram Context объект
+    """
+    global _top_cache
+
+    async with _top_lock:
+        if _top_cache is None or _top_cache[1] <= time.monotonic():
+            _top_cache = (build_top_message(), time.monotonic() + TOP_CACHE_TTL)
+        message = _top_cache[0]
+
+    if not message:
+        await update.message.reply_text("Пока нет земельных участков в базе данных.")
+        return
+
+    await update.message.reply_text(message)
+
+
 async def map_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Обрабатывает команду /map - отправляет ссылку на карту
@@ -170,7 +228,7 @@ async def send_alert(application: Application, chat_id: int, land_opp: LandOppor
     session = get_session()
     try:
         # Получить связанный Property
-        prop = session.query(Property).filter_by(id=land_opp.property_id).first()
+        prop = session.query(Property).filter_by(mls_number=land_opp.mls_number).first()
 
         if not prop:
             return False
@@ -180,43 +238,39 @@ async def send_alert(application: Application, chat_id: int, land_opp: LandOppor
         price_str = format_currency(price) if price else 'N/A'
 
         # Emoji для urgency
-        if land_opp.urgency_level == 'urgent':
-            emoji = '🔥 СРОЧНО!'
-            title = 'НОВЫЙ СРОЧНЫЙ УЧАСТОК'
-        elif land_opp.urgency_level == 'good':
-            emoji = '⭐'
-            title = 'НОВАЯ ХОРОШАЯ ВОЗМОЖНОСТЬ'
-        else:
-            emoji = '✅'
-            title = 'НОВЫЙ УЧАСТОК'
+        emoji, title = _URGENCY.get(land_opp.urgency_level, _URGENCY[None])
 
         # Сформировать сообщение
-        message = f"{emoji} {title}\n\n"
-        message += f"📊 Urgency Score: {land_opp.urgency_score}/100\n\n"
-        message += f"📍 Адрес: {prop.address}\n"
-        message += f"🏙️ Город: {prop.city}, {prop.state} {prop.zip}\n\n"
-        message += f"💰 Цена: {price_str}\n"
+        fields = defaultdict(str, {
+            'emoji': emoji,
+            'title': title,
+            'score': land_opp.urgency_score,
+            'address': prop.address,
+            'city': prop.city,
+            'state': prop.state,
+            'zip': prop.zip,
+            'price_str': price_str,
+            'zone': land_opp.zone_color.replace('_', ' ').title(),
+            'market': land_opp.market_status.title(),
+            'nearby_avg_price_sqft': land_opp.nearby_avg_price_sqft,
+            'nearby_sales_count': land_opp.nearby_sales_count
+        })
 
         if prop.lot_size:
-            message += f"📐 Размер: {prop.lot_size:.2f} acres\n"
+            fields['lot_size_line'] = f"📐 Размер: {prop.lot_size:.2f} acres\n"
             # Рассчитать цену за акр
             if price:
-                price_per_acre = price / prop.lot_size
-                message += f"💵 Цена за акр: ${price_per_acre:,.0f}\n"
+                fields['price_per_acre_line'] = f"💵 Цена за акр: ${price / prop.lot_size:,.0f}\n"
 
         # Добавить MLS номер
         if prop.mls_number:
-            message += f"🏠 MLS: {prop.mls_number}\n"
+            fields['mls_line'] = f"🏠 MLS: {prop.mls_number}\n"
 
         # Добавить URL листинга
         if prop.url:
-            message += f"🔗 Ссылка: {prop.url}\n"
+            fields['url_line'] = f"🔗 Ссылка: {prop.url}\n"
 
-        message += f"\n🟢 Зона: {land_opp.zone_color.replace('_', ' ').title()}\n"
-        message += f"📈 Рынок: {land_opp.market_status.title()}\n"
-        message += f"🏘️ Средняя цена района: ${land_opp.nearby_avg_price_sqft:.2f}/sqft\n"
-        message += f"📊 Продаж за 90 дней: {land_opp.recent_sales_count}\n\n"
-        message += f"💡 {land_opp.notes}"
+        message = _ALERT_TEMPLATE.format_map(fields)
 
         # Отправить сообщение
         await application.bot.send_message(chat_id=chat_id, text=message)
@@ -241,6 +295,14 @@ def run_bot() -> None:
 
     print("🤖 Запускаю Telegram бота...")
 
+    # uvloop - более быстрый event loop (не поддерживается на Windows)
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
     # Создать приложение
     application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
 
@@ -256,8 +318,8 @@ def run_bot() -> None:
     print("   /top - топ участков")
     print("   /map - ссылка на карту")
 
-    # Запустить polling
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Запустить polling (длинный long-poll уменьшает число запросов getUpdates)
+    application.run_polling(allowed_updates=Update.ALL_TYPES, poll_interval=0.5, timeout=30)
 
 
 if __name__ == '__main__':
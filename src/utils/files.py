@@ -0,0 +1,45 @@
+"""
+Запись файлов на диск
+"""
+
+import os
+import tempfile
+
+# Буфер записи - большие страницы пишутся за несколько системных вызовов
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def write_text_atomic(path: str, text, encoding: str = 'utf-8'):
+    """
+    Атомарно записывает текст в файл (временный файл + fsync + os.replace)
+
+    При сбое на середине записи старый файл остаётся целым, временный файл удаляется.
+    Временный файл уникален, поэтому одновременные записи в один путь не мешают друг другу.
+
+    Args:
+        path: Путь к файлу
+        text: Текст (str) или уже закодированные байты
+        encoding: Кодировка для str
+    """
+    data = text if isinstance(text, bytes) else text.encode(encoding)
+
+    # Временный файл в той же папке - os.replace не переходит между файловыми системами
+    tmp = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path) or '.',
+        prefix=f".{os.path.basename(path)}.",
+        suffix='.tmp',
+        buffering=WRITE_BUFFER_SIZE,
+        delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, path)
+    except BaseException:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+        raise
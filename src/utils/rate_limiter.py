@@ -0,0 +1,72 @@
+"""
+Ограничитель частоты запросов (token bucket)
+Используется для внешних API с лимитами: Nominatim, Telegram
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket
+    Токены пополняются со скоростью rate в секунду, но не больше capacity
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Скорость пополнения (токенов в секунду)
+            capacity: Максимальное количество токенов (размер всплеска)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Пополняет токены за прошедшее время (вызывать под блокировкой)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1):
+        """
+        Забирает токены, ожидая только если их не хватает
+
+        Args:
+            tokens: Количество токенов
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """
+        То же что acquire, но не блокирует event loop
+
+        Args:
+            tokens: Количество токенов
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            await asyncio.sleep(wait)
+
+
+# Общий лимит для всех запросов к Nominatim
+# ВАЖНО: политика Nominatim - не больше 1 запроса в секунду, поэтому без всплесков
+nominatim_limiter = TokenBucket(rate=1.0, capacity=1)
@@ -2,13 +2,22 @@
 Flask Web Application - UI Interface for Asheville Land Analyzer
 """
 
-from flask import Flask, render_template, jsonify, request, flash, redirect
+from flask import Flask, Response, render_template, request, flash, redirect
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
+from flask_caching import Cache
 import sys
 import os
+import gzip
+import orjson
+import time
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime
+from sqlalchemy import func, case, and_, select
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,6 +30,93 @@ from analyzers.price_calculator import calculate_price_per_sqft, extract_street_
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'csv'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_COPY_BUFFER = 1024 * 1024  # 1MB blocks when copying the upload to disk
+CSV_CHUNK_SIZE = 10_000  # Rows per chunk (and per commit) during CSV import
+API_CACHE_TTL = 60  # Seconds to reuse read-only API responses
+STATS_CACHE_TTL = 15  # Seconds to reuse /api/stats result
+UPSERT_BATCH_SIZE = 500  # Rows per INSERT ... ON CONFLICT statement (SQLite parameter limit)
+PROPERTIES_DEFAULT_LIMIT = 15000  # Increased to include all properties
+SERVER_THREADS = 8  # Worker threads of the production server
+MAX_IMPORT_JOBS = 50  # Finished import jobs kept for /api/import/status
+
+# Common ZIP codes for cities near Asheville (used when CITY is missing)
+ZIP_TO_CITY = {
+    '28801': 'Asheville', '28802': 'Asheville', '28803': 'Asheville',
+    '28804': 'Asheville', '28805': 'Asheville', '28806': 'Asheville',
+    '28704': 'Arden', '28711': 'Black Mountain', '28715': 'Candler',
+    '28716': 'Canton', '28732': 'Fletcher', '28739': 'Flat Rock',
+    '28748': 'Leicester', '28753': 'Marshall', '28754': 'Mars Hill',
+    '28778': 'Swannanoa', '28787': 'Weaverville',
+    '28791': 'Hendersonville', '28792': 'Hendersonville',
+    '28785': 'Waynesville', '28786': 'Waynesville'
+}
+
+# Property columns filled by CSV import
+PROPERTY_IMPORT_COLUMNS = (
+    'mls_number', 'address', 'street_name', 'city', 'state', 'zip',
+    'latitude', 'longitude', 'sale_price', 'list_price', 'sqft', 'price_per_sqft',
+    'bedrooms', 'bathrooms', 'lot_size', 'status', 'days_on_market', 'url', 'archived'
+)
+
+# Processed CSV columns read by the import loop (in tuple order)
+IMPORT_ROW_COLUMNS = (
+    'mls_number', 'address', 'city', 'state', 'zip', 'sqft', 'status', 'price',
+    'latitude', 'longitude', 'bedrooms', 'bathrooms', 'lot_size', 'days_on_market', 'url',
+    'street_name'
+)
+
+# Map Redfin columns to our database columns
+REDFIN_COLUMNS = {
+    'ADDRESS': 'address',
+    'CITY': 'city',
+    'STATE OR PROVINCE': 'state',
+    'ZIP OR POSTAL CODE': 'zip',
+    'PRICE': 'price',
+    'BEDS': 'bedrooms',
+    'BATHS': 'bathrooms',
+    'SQUARE FEET': 'sqft',
+    'LOT SIZE': 'lot_size',
+    'YEAR BUILT': 'year_built',
+    'DAYS ON MARKET': 'days_on_market',
+    '$/SQUARE FEET': 'price_per_sqft',
+    'STATUS': 'status',
+    'MLS#': 'mls_number',
+    'LATITUDE': 'latitude',
+    'LONGITUDE': 'longitude',
+    'PROPERTY TYPE': 'property_type',
+    'SOLD DATE': 'sold_date'
+}
+
+# ZIP codes and MLS numbers are read as text so they are not turned into floats (28801.0)
+# Chunks infer dtypes separately - without this MLS# is float in the chunk with the
+# warning row (NaN) and int in the others, giving "4123456.0" and "4123456"
+REDFIN_DTYPES = {'ZIP OR POSTAL CODE': str, 'MLS#': str}
+
+# Statements for the read endpoints, built once at import time
+# Only the columns used in the responses are selected, no ORM objects
+PROPERTIES_STMT = select(
+    Property.id, Property.address, Property.city,
+    Property.latitude, Property.longitude,
+    Property.sale_price, Property.list_price, Property.price_per_sqft,
+    Property.status, Property.sqft, Property.lot_size, Property.url
+).where(
+    Property.latitude != None,
+    Property.longitude != None,
+    Property.archived == False
+)
+
+STREETS_STMT = select(
+    StreetAnalysis.street_name, StreetAnalysis.city, StreetAnalysis.color,
+    StreetAnalysis.median_price_sqft, StreetAnalysis.sample_size,
+    StreetAnalysis.confidence_score
+)
+
+OPPORTUNITIES_STMT = select(LandOpportunity, Property).join(
+    LandOpportunity.property
+).where(
+    Property.latitude != None,
+    Property.longitude != None
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -31,99 +127,157 @@ app.config['SECRET_KEY'] = 'asheville-land-analyzer-2024'
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Response cache for read-only endpoints (cleared after each CSV import)
+# Redis is used when REDIS_URL is set, otherwise an in-process cache
+cache = Cache(app, config={
+    'CACHE_TYPE': 'RedisCache' if os.getenv('REDIS_URL') else 'SimpleCache',
+    'CACHE_REDIS_URL': os.getenv('REDIS_URL'),
+    'CACHE_DEFAULT_TIMEOUT': API_CACHE_TTL
+})
+
+# CSV imports run in the background, one at a time (single DB writer)
+# Job state is per process - the app must run as a single worker (see wsgi.py)
+import_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='csv-import')
+import_jobs = {}  # job_id -> job status dict
+import_jobs_lock = threading.Lock()
+
+# Precomputed /api/properties payload for default arguments: (built_at, json_bytes, gzip_bytes)
+# Rebuilt once older than API_CACHE_TTL (other processes write properties too) and after each CSV import
+_properties_payload = None
+
+def ojson(data, status=200):
+    """JSON response serialized with orjson (faster than jsonify for large lists)"""
+    return app.response_class(orjson.dumps(data), status=status, mimetype='application/json')
+
 @app.route('/')
 def index():
     """Main page with Google Maps"""
     return render_template('index.html')
 
 @app.route('/api/stats')
+@cache.cached(timeout=STATS_CACHE_TTL)
 def get_stats():
     """Get database statistics"""
     session = get_session()
     try:
-        properties_with_url = session.query(Property).filter(
-            Property.url != None,
-            Property.url != ''
-        ).count()
-
-        active_properties = session.query(Property).filter(
-            Property.status.in_(['active', 'Active', 'ACTIVE'])
-        ).count()
+        # All Property counts in one query
+        total_properties, active_properties, properties_with_url = session.query(
+            func.count(Property.id),
+            func.sum(case((Property.status.in_(['active', 'Active', 'ACTIVE']), 1), else_=0)),
+            func.sum(case((and_(Property.url != None, Property.url != ''), 1), else_=0))
+        ).one()
 
         stats = {
-            'properties': session.query(Property).count(),
-            'active_properties': active_properties,
-            'properties_with_url': properties_with_url,
+            'properties': total_properties,
+            'active_properties': int(active_properties or 0),
+            'properties_with_url': int(properties_with_url or 0),
             'streets': session.query(StreetAnalysis).count(),
             'opportunities': session.query(LandOpportunity).count(),
             'market_zones': session.query(MarketHeatZone).count()
         }
-        return jsonify(stats)
+        return ojson(stats)
     finally:
         session.close()
 
+def query_properties(session, city=None, limit=PROPERTIES_DEFAULT_LIMIT):
+    """Query properties with coordinates and build the API response data"""
+    # Get all properties (filtering will be done on frontend)
+    stmt = PROPERTIES_STMT
+
+    # Filter by city if specified
+    if city:
+        stmt = stmt.where(Property.city == city)
+
+    # Apply limit
+    properties = session.execute(stmt.limit(limit)).all()
+
+    data = []
+    for (prop_id, address, prop_city, lat, lng, sale_price, list_price,
+         price_sqft, status, sqft, lot_size, url) in properties:
+        data.append({
+            'id': prop_id,
+            'address': address,
+            'city': prop_city,
+            'lat': lat,
+            'lng': lng,
+            'price': sale_price or list_price,
+            'price_sqft': price_sqft,
+            'status': status,
+            'sqft': sqft,
+            'lot_size': lot_size,
+            'url': url
+        })
+
+    return data
+
+def rebuild_properties_cache():
+    """Serialize and gzip the default /api/properties payload once"""
+    global _properties_payload
+
+    session = get_session()
+    try:
+        data = query_properties(session)
+    finally:
+        session.close()
+
+    raw = orjson.dumps(data)
+    _properties_payload = (time.monotonic(), raw, gzip.compress(raw, compresslevel=6))
+    return _properties_payload
+
+def get_properties_payload():
+    """Precomputed default payload, rebuilt when missing or older than API_CACHE_TTL"""
+    payload = _properties_payload
+    if payload is None or time.monotonic() - payload[0] > API_CACHE_TTL:
+        payload = rebuild_properties_cache()
+    return payload
+
+def is_default_properties_request():
+    """True if /api/properties is requested without city filter and with default limit"""
+    return (not request.args.get('city')
+            and request.args.get('limit', PROPERTIES_DEFAULT_LIMIT, type=int) == PROPERTIES_DEFAULT_LIMIT)
+
 @app.route('/api/properties')
+@cache.cached(query_string=True, unless=is_default_properties_request)
 def get_properties():
     """Get all properties with coordinates"""
+    # Default arguments - serve the precomputed payload without touching the DB
+    if is_default_properties_request():
+        _, raw, gzipped = get_properties_payload()
+        if 'gzip' in request.accept_encodings:
+            return Response(gzipped, mimetype='application/json',
+                            headers={'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'})
+        return Response(raw, mimetype='application/json', headers={'Vary': 'Accept-Encoding'})
+
     session = get_session()
     try:
         # Get query parameters
         city = request.args.get('city', None)
-        limit = request.args.get('limit', 15000, type=int)  # Increased to include all properties
-
-        # Build query - get all properties (filtering will be done on frontend)
-        query = session.query(Property).filter(
-            Property.latitude != None,
-            Property.longitude != None,
-            Property.archived == False
-        )
-
-        # Filter by city if specified
-        if city:
-            query = query.filter(Property.city == city)
-
-        # Apply limit
-        properties = query.limit(limit).all()
+        limit = request.args.get('limit', PROPERTIES_DEFAULT_LIMIT, type=int)
 
-        data = []
-        for prop in properties:
-            data.append({
-                'id': prop.id,
-                'address': prop.address,
-                'city': prop.city,
-                'lat': prop.latitude,
-                'lng': prop.longitude,
-                'price': prop.sale_price or prop.list_price,
-                'price_sqft': prop.price_per_sqft,
-                'status': prop.status,
-                'sqft': prop.sqft,
-                'lot_size': prop.lot_size,
-                'url': prop.url
-            })
-
-        return jsonify(data)
+        return ojson(query_properties(session, city, limit))
     finally:
         session.close()
 
 @app.route('/api/streets')
+@cache.cached(query_string=True)
 def get_streets():
     """Get street analysis data"""
     session = get_session()
     try:
-        streets = session.query(StreetAnalysis).all()
+        streets = session.execute(STREETS_STMT).all()
 
         data = []
-        for street in streets:
+        for street_name, city, color, median_price_sqft, sample_size, confidence in streets:
             data.append({
-                'street_name': street.street_name,
-                'city': street.city,
-                'color': street.color,
-                'median_price_sqft': street.median_price_sqft,
-                'sample_size': street.sample_size,
-                'confidence': street.confidence_score
+                'street_name': street_name,
+                'city': city,
+                'color': color,
+                'median_price_sqft': median_price_sqft,
+                'sample_size': sample_size,
+                'confidence': confidence
             })
 
-        return jsonify(data)
+        return ojson(data)
     finally:
         session.close()
 
@@ -132,12 +286,12 @@ def get_opportunities():
     """Get land opportunities"""
     session = get_session()
     try:
-        opportunities = session.query(LandOpportunity).all()
+        # One JOIN query instead of a Property lookup per opportunity
+        rows = session.execute(OPPORTUNITIES_STMT).all()
 
         data = []
-        for opp in opportunities:
-            prop = session.query(Property).filter_by(id=opp.property_id).first()
-            if prop and prop.latitude and prop.longitude:
+        for opp, prop in rows:
+            if prop.latitude and prop.longitude:
                 data.append({
                     'id': opp.id,
                     'address': prop.address,
@@ -148,18 +302,18 @@ def get_opportunities():
                     'zone_color': opp.zone_color,
                     'market_status': opp.market_status,
                     'price': prop.list_price or prop.sale_price,
-                    'lot_size': prop.lot_size,
-                    'notes': opp.notes
+                    'lot_size': prop.lot_size
                 })
 
-        return jsonify(data)
+        return ojson(data)
     finally:
         session.close()
 
 @app.route('/api/config')
+@cache.cached(query_string=True)
 def get_config():
     """Get map configuration"""
-    return jsonify({
+    return ojson({
         'center': {
             'lat': CITY_CENTER['lat'],
             'lng': CITY_CENTER['lon']
@@ -168,11 +322,11 @@ def get_config():
     })
 
 @app.route('/api/cities')
+@cache.cached(query_string=True)
 def get_cities():
     """Get list of cities with property counts"""
     session = get_session()
     try:
-        from sqlalchemy import func
         cities = session.query(
             Property.city,
             func.count(Property.id).label('count')
@@ -180,7 +334,7 @@ def get_cities():
             Property.archived == False
         ).group_by(Property.city).order_by(func.count(Property.id).desc()).all()
 
-        return jsonify([{
+        return ojson([{
             'city': city,
             'count': count
         } for city, count in cities])
@@ -191,49 +345,46 @@ def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def parse_redfin_csv(filepath):
-    """Parse Redfin CSV format and return processed data"""
+def iter_redfin_chunks(filepath, chunksize=CSV_CHUNK_SIZE):
+    """Read Redfin CSV in chunks and yield processed data for each chunk"""
+    # Peek at the header to read only the columns we use
+    header = list(pd.read_csv(filepath, nrows=0).columns)
+    url_col = next((col for col in header if 'URL' in col.upper()), None)
+
+    # The first column is kept for the warning row check below
+    usecols = [col for col in header
+               if col == header[0] or col in REDFIN_COLUMNS or col == url_col]
+
     # Read CSV - the warning is on row 2, not row 1
-    df = pd.read_csv(filepath)
+    # Numeric columns are converted below with errors='coerce' because of the warning row
+    reader = pd.read_csv(filepath, usecols=usecols, dtype=REDFIN_DTYPES, chunksize=chunksize)
+
+    for chunk_num, df in enumerate(reader):
+        # Remove the warning row if it exists (check if first column contains warning text)
+        # Row index is kept so it stays unique across chunks
+        if chunk_num == 0 and len(df) > 0 and 'accordance' in str(df.iloc[0, 0]).lower():
+            df = df.iloc[1:]
 
-    # Remove the warning row if it exists (check if first column contains warning text)
-    if len(df) > 0 and 'accordance' in str(df.iloc[0, 0]).lower():
-        df = df.iloc[1:].reset_index(drop=True)
+        yield clean_redfin_chunk(df, url_col)
 
+def clean_redfin_chunk(df, url_col=None):
+    """Map Redfin columns to database columns and clean the data"""
     # Remove any completely empty rows
     df = df.dropna(how='all')
 
-    # Map Redfin columns to our database columns
-    column_mapping = {
-        'ADDRESS': 'address',
-        'CITY': 'city',
-        'STATE OR PROVINCE': 'state',
-        'ZIP OR POSTAL CODE': 'zip',
-        'PRICE': 'price',
-        'BEDS': 'bedrooms',
-        'BATHS': 'bathrooms',
-        'SQUARE FEET': 'sqft',
-        'LOT SIZE': 'lot_size',
-        'YEAR BUILT': 'year_built',
-        'DAYS ON MARKET': 'days_on_market',
-        '$/SQUARE FEET': 'price_per_sqft',
-        'STATUS': 'status',
-        'MLS#': 'mls_number',
-        'LATITUDE': 'latitude',
-        'LONGITUDE': 'longitude',
-        'PROPERTY TYPE': 'property_type',
-        'SOLD DATE': 'sold_date'
-    }
-
-    # Find and map URL column (it has a long name in Redfin CSV)
-    for col in df.columns:
-        if 'URL' in col.upper():
-            column_mapping[col] = 'url'
-            break
+    # Map URL column too (it has a long name in Redfin CSV)
+    column_mapping = dict(REDFIN_COLUMNS)
+    if url_col:
+        column_mapping[url_col] = 'url'
 
     # Rename columns
     df = df.rename(columns=column_mapping)
 
+    # MLS number as one text format for every chunk and every earlier import
+    if 'mls_number' in df.columns:
+        mls = df['mls_number'].astype('string').str.strip().str.replace(r'\.0+$', '', regex=True)
+        df['mls_number'] = mls.mask(mls.isna() | mls.str.lower().isin(['', 'nan', 'none']))
+
     # Clean and convert data
     if 'price' in df.columns:
         df['price'] = pd.to_numeric(df['price'], errors='coerce')
@@ -281,195 +432,304 @@ def parse_redfin_csv(filepath):
         df = df.dropna(subset=['sqft'])
         df = df[df['sqft'] > 0]
 
+    # Fill defaults for the database columns (whole columns at once instead of per row)
+    df = df.copy()
+    for col in ('city', 'state', 'zip'):
+        if col not in df.columns:
+            df[col] = None
+    if 'status' not in df.columns:
+        df['status'] = 'active'
+
+    # ZIP code as text, empty if missing
+    df['zip'] = df['zip'].where(df['zip'].notna(), '').astype(str)
+    df.loc[df['zip'].str.lower() == 'nan', 'zip'] = ''
+    df['zip'] = df['zip'].str.slice(0, 10)
+
+    # City - determine from ZIP code if missing, Asheville by default
+    city_str = df['city'].astype(str).str.strip().str.lower()
+    city_missing = df['city'].isna() | city_str.isin(['', 'nan', 'none'])
+    df.loc[city_missing, 'city'] = (
+        df.loc[city_missing, 'zip'].str.slice(0, 5).map(ZIP_TO_CITY).fillna('Asheville')
+    )
+
+    # State - NC by default
+    state_str = df['state'].astype(str).str.strip().str.lower()
+    df.loc[df['state'].isna() | state_str.isin(['', 'nan', 'none']), 'state'] = 'NC'
+
+    # Sqft - use 1 for vacant land or missing data
+    df['sqft'] = df['sqft'].fillna(1)
+    df.loc[df['sqft'] <= 0, 'sqft'] = 1
+
+    # Extract street names for the whole column
+    df['street_name'] = df['address'].astype(str).map(extract_street_name)
+
+    # Numeric columns that are stored as integers/floats
+    for col in ('bedrooms', 'bathrooms'):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
     return df
 
+def build_upsert(insert, records):
+    """INSERT ... ON CONFLICT (mls_number) DO UPDATE for a list of property records"""
+    stmt = insert(Property).values(records)
+    return stmt.on_conflict_do_update(
+        index_elements=['mls_number'],
+        set_={
+            'status': stmt.excluded.status,
+            'list_price': func.coalesce(stmt.excluded.list_price, Property.list_price),
+            'sale_price': func.coalesce(stmt.excluded.sale_price, Property.sale_price),
+            'url': func.coalesce(func.nullif(Property.url, ''), stmt.excluded.url),
+            'updated_at': datetime.utcnow()
+        }
+    )
+
+def upsert_properties(session, records, errors):
+    """
+    Insert properties, updating the existing ones by MLS number (INSERT ... ON CONFLICT DO UPDATE)
+
+    Existing properties get the new status and price, URL is only filled if not already set.
+    Each batch is committed on its own; a failing batch is retried row by row so one bad row
+    only costs that row (appended to errors). Returns (inserted, updated).
+    """
+    if session.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    inserted = updated = 0
+    for start in range(0, len(records), UPSERT_BATCH_SIZE):
+        batch = records[start:start + UPSERT_BATCH_SIZE]
+
+        # MLS numbers already stored - tells inserts from updates (other processes write too,
+        # so the table row count can't be used for that)
+        existing = set(session.scalars(
+            select(Property.mls_number).where(Property.mls_number.in_([r['mls_number'] for r in batch]))
+        ))
+
+        try:
+            session.execute(build_upsert(insert, batch))
+            session.commit()
+        except Exception:
+            session.rollback()
+
+            # Retry the batch row by row to isolate the failing rows
+            written = []
+            for record in batch:
+                try:
+                    session.execute(build_upsert(insert, [record]))
+                    session.commit()
+                    written.append(record)
+                except Exception as e:
+                    session.rollback()
+                    error_msg = f"MLS {record['mls_number']} ({record['address'] or 'Unknown'}): {str(e)}"
+                    errors.append(error_msg)
+                    print(f"Import error: {error_msg}")
+            batch = written
+
+        batch_updated = sum(1 for r in batch if r['mls_number'] in existing)
+        updated += batch_updated
+        inserted += len(batch) - batch_updated
+
+    return inserted, updated
+
+def import_redfin_chunk(session, df, seen_mls, errors):
+    """
+    Import one processed chunk to the database
+
+    seen_mls collects MLS numbers across chunks (repeated rows are skipped),
+    row errors are appended to errors. Returns (inserted, updated) row counts.
+    """
+    records = []
+
+    # Prefix for generated MLS numbers (computed once, not per row)
+    time_prefix = int(time.time())
+
+    # Missing optional columns and NaN cells become None in one pass (no per-cell pd.notna)
+    rows = df.reindex(columns=IMPORT_ROW_COLUMNS).astype(object)
+    rows = rows.where(rows.notna(), None)
+
+    # Plain tuples - no Series object per row like iterrows()
+    for (idx, mls_num, address, city, state, zip_code, sqft, status, price,
+         lat, lng, bedrooms, bathrooms, lot_size, days_on_market, url,
+         street_name) in rows.itertuples(index=True, name=None):
+        try:
+            # Generate unique MLS number if missing or invalid
+            if mls_num is not None and str(mls_num).lower() != 'nan':
+                mls_number = str(mls_num)
+
+                # Same MLS repeated within the file - keep the first row only
+                if mls_number in seen_mls:
+                    continue
+                seen_mls.add(mls_number)
+            else:
+                # Generate unique ID based on timestamp and index
+                mls_number = f'IMP_{time_prefix}_{idx}'
+
+            # Every record has the same keys (required for a multi-row INSERT)
+            property_data = dict.fromkeys(PROPERTY_IMPORT_COLUMNS)
+            property_data.update({
+                'mls_number': mls_number,
+                'address': address,
+                'street_name': street_name,
+                'city': city,
+                'state': state,
+                'zip': zip_code,
+                'sqft': sqft,
+                'status': status,
+                'latitude': lat,
+                'longitude': lng,
+                'lot_size': lot_size,
+                'archived': False
+            })
+
+            # Add optional fields
+            if price is not None:
+                if status == 'sold':
+                    property_data['sale_price'] = price
+                else:
+                    property_data['list_price'] = price
+
+                # Calculate price per sqft
+                property_data['price_per_sqft'] = calculate_price_per_sqft(price, sqft)
+
+            if bedrooms is not None:
+                property_data['bedrooms'] = int(bedrooms)
+            if bathrooms is not None:
+                property_data['bathrooms'] = float(bathrooms)
+            if days_on_market is not None:
+                property_data['days_on_market'] = int(days_on_market)
+            if url is not None:
+                property_data['url'] = str(url)
+
+            records.append(property_data)
+
+        except Exception as e:
+            error_msg = f"Row {idx} ({address or 'Unknown'}): {str(e)}"
+            errors.append(error_msg)
+            print(f"Import error: {error_msg}")
+            continue
+
+    # Write the chunk with UPSERT statements (committed batch by batch)
+    return upsert_properties(session, records, errors)
+
 @app.route('/api/import', methods=['POST'])
 def import_csv():
     """Import CSV file with property data"""
     try:
         # Check if file is in request
         if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+            return ojson({'error': 'No file provided'}, 400)
 
         file = request.files['file']
 
         # Check if file has a filename
         if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+            return ojson({'error': 'No file selected'}, 400)
 
         # Check if file is allowed
         if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Only CSV files are allowed'}), 400
-
-        # Save file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-
-        # Parse CSV based on format
-        df = parse_redfin_csv(filepath)
-
-        # Import to database
-        session = get_session()
-        imported_count = 0
-        updated_count = 0
-        errors = []
-
-        for idx, row in df.iterrows():
-            try:
-                # Check if property already exists
-                existing = None
-                mls_num = row.get('mls_number')
-                if pd.notna(mls_num) and str(mls_num).lower() != 'nan':
-                    existing = session.query(Property).filter_by(
-                        mls_number=str(mls_num)
-                    ).first()
-
-                if existing:
-                    # Update existing property
-                    if pd.notna(row.get('price')):
-                        if row.get('status') == 'sold':
-                            existing.sale_price = row['price']
-                        else:
-                            existing.list_price = row['price']
-
-                    existing.status = row.get('status', 'active')
-
-                    # Update URL if available and not already set
-                    if pd.notna(row.get('url')) and not existing.url:
-                        existing.url = str(row['url'])
-
-                    existing.updated_at = datetime.utcnow()
-                    updated_count += 1
-                else:
-                    # Create new property
-                    # Generate unique MLS number if missing or invalid
-                    mls_number = None
-                    if pd.notna(mls_num) and str(mls_num).lower() != 'nan':
-                        mls_number = str(mls_num)
-                    else:
-                        # Generate unique ID based on timestamp and index
-                        import time
-                        mls_number = f'IMP_{int(time.time())}_{idx}'
-
-                    # Handle city field - use default if missing or nan
-                    city = row.get('city', 'Asheville')
-                    if pd.isna(city) or str(city).lower() == 'nan' or not city:
-                        # Try to determine city from ZIP code if available
-                        zip_code_temp = row.get('zip', '')
-                        if pd.notna(zip_code_temp) and str(zip_code_temp).startswith('287'):
-                            # Common ZIP prefixes for cities near Asheville
-                            zip_prefix = str(zip_code_temp)[:5]
-                            zip_to_city = {
-                                '28801': 'Asheville', '28802': 'Asheville', '28803': 'Asheville',
-                                '28804': 'Asheville', '28805': 'Asheville', '28806': 'Asheville',
-                                '28704': 'Arden', '28711': 'Black Mountain', '28715': 'Candler',
-                                '28716': 'Canton', '28732': 'Fletcher', '28739': 'Flat Rock',
-                                '28748': 'Leicester', '28753': 'Marshall', '28754': 'Mars Hill',
-                                '28778': 'Swannanoa', '28787': 'Weaverville',
-                                '28791': 'Hendersonville', '28792': 'Hendersonville',
-                                '28785': 'Waynesville', '28786': 'Waynesville'
-                            }
-                            city = zip_to_city.get(zip_prefix, 'Asheville')
-                        else:
-                            city = 'Asheville'  # Default city
-
-                    # Handle state field
-                    state = row.get('state', 'NC')
-                    if pd.isna(state) or str(state).lower() == 'nan' or not state:
-                        state = 'NC'
-
-                    # Handle zip code
-                    zip_code = row.get('zip', '')
-                    if pd.notna(zip_code) and str(zip_code).lower() != 'nan':
-                        zip_code = str(zip_code)[:10]
-                    else:
-                        zip_code = ''
-
-                    # Handle sqft - use 1 for vacant land if needed
-                    sqft = row['sqft']
-                    if pd.isna(sqft) or sqft <= 0:
-                        sqft = 1  # Default for vacant land or missing data
-
-                    property_data = {
-                        'mls_number': mls_number,
-                        'address': row['address'],
-                        'city': city,
-                        'state': state,
-                        'zip': zip_code,
-                        'sqft': sqft,
-                        'status': row.get('status', 'active'),
-                        'archived': False
-                    }
-
-                    # Add optional fields
-                    if pd.notna(row.get('price')):
-                        if row.get('status') == 'sold':
-                            property_data['sale_price'] = row['price']
-                        else:
-                            property_data['list_price'] = row['price']
-
-                        # Calculate price per sqft
-                        property_data['price_per_sqft'] = calculate_price_per_sqft(
-                            row['price'], row['sqft']
-                        )
-
-                    if pd.notna(row.get('latitude')):
-                        property_data['latitude'] = row['latitude']
-                    if pd.notna(row.get('longitude')):
-                        property_data['longitude'] = row['longitude']
-                    if pd.notna(row.get('bedrooms')):
-                        property_data['bedrooms'] = int(row['bedrooms'])
-                    if pd.notna(row.get('bathrooms')):
-                        property_data['bathrooms'] = float(row['bathrooms'])
-                    if pd.notna(row.get('lot_size')):
-                        property_data['lot_size'] = row['lot_size']
-                    if pd.notna(row.get('days_on_market')):
-                        property_data['days_on_market'] = int(row['days_on_market'])
-                    if pd.notna(row.get('url')):
-                        property_data['url'] = str(row['url'])
-
-                    # Extract street name
-                    property_data['street_name'] = extract_street_name(row['address'])
-
-                    new_property = Property(**property_data)
-                    session.add(new_property)
-                    imported_count += 1
-
-            except Exception as e:
-                error_msg = f"Row {idx} ({row.get('address', 'Unknown')}): {str(e)}"
-                errors.append(error_msg)
-                print(f"Import error: {error_msg}")
-                continue
-
-        # Commit changes
-        session.commit()
-        session.close()
+            return ojson({'error': 'Invalid file type. Only CSV files are allowed'}, 400)
+
+        # Copy the upload to a unique temp file in 1MB blocks
+        # (the CSV is read twice: header peek, then chunks)
+        with tempfile.NamedTemporaryFile(
+            suffix='.csv', dir=app.config['UPLOAD_FOLDER'], delete=False
+        ) as tmp:
+            shutil.copyfileobj(file.stream, tmp, length=UPLOAD_COPY_BUFFER)
+            filepath = tmp.name
+
+        # Queue the import and return right away - progress is polled via /api/import/status
+        job_id = uuid.uuid4().hex
+        with import_jobs_lock:
+            import_jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'filename': file.filename,
+                'total_processed': 0,
+                'imported': 0,
+                'updated': 0,
+                'errors': []
+            }
+
+            # Forget the oldest completed jobs
+            done = [jid for jid, j in import_jobs.items() if j['status'] in ('finished', 'failed')]
+            for old_id in done[:max(0, len(import_jobs) - MAX_IMPORT_JOBS)]:
+                del import_jobs[old_id]
+
+        import_executor.submit(run_import, job_id, filepath)
+
+        return ojson({'success': True, 'job_id': job_id, 'status': 'queued'}, 202)
 
-        # Clean up uploaded file
-        os.remove(filepath)
+    except Exception as e:
+        return ojson({'error': str(e)}, 500)
 
-        return jsonify({
-            'success': True,
-            'imported': imported_count,
-            'updated': updated_count,
-            'total_processed': len(df),
-            'errors': errors[:10]  # Return first 10 errors only
-        })
+def run_import(job_id, filepath):
+    """Import uploaded CSV to database chunk by chunk (runs in import_executor)"""
+    # Job dicts are read by /api/import/status - every change is made under import_jobs_lock
+    with import_jobs_lock:
+        job = import_jobs[job_id]
+        job['status'] = 'running'
+
+    session = get_session()
+    errors = []
+    seen_mls = set()
+
+    try:
+        for df in iter_redfin_chunks(filepath):
+            inserted, updated = import_redfin_chunk(session, df, seen_mls, errors)
+            with import_jobs_lock:
+                job['imported'] += inserted
+                job['updated'] += updated
+                job['total_processed'] += len(df)
+                job['errors'] = errors[:10]  # Return first 10 errors only
+
+        with import_jobs_lock:
+            job['status'] = 'finished'
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        print(f"Import failed: {e}")
+        with import_jobs_lock:
+            job['error'] = str(e)
+            job['status'] = 'failed'
+
+    finally:
+        session.close()
+
+        # Clean up uploaded file (also when the import fails)
+        try:
+            os.remove(filepath)
+        except OSError as e:
+            print(f"Failed to remove uploaded file {filepath}: {e}")
+
+        # Data may have changed - drop cached API responses and rebuild the properties payload
+        try:
+            cache.clear()
+            rebuild_properties_cache()
+        except Exception as e:
+            print(f"Failed to refresh API cache after import: {e}")
+            with import_jobs_lock:
+                job['cache_error'] = str(e)
 
 @app.route('/api/import/status')
 def import_status():
-    """Get current import status and statistics"""
+    """Get current import status and statistics (or status of one import job with ?job_id=)"""
+    job_id = request.args.get('job_id')
+    if job_id:
+        with import_jobs_lock:
+            job = import_jobs.get(job_id)
+            job = dict(job) if job is not None else None
+        if job is None:
+            return ojson({'error': 'Unknown import job'}, 404)
+        return ojson(job)
+
     session = get_session()
     try:
         total_properties = session.query(Property).count()
         active_properties = session.query(Property).filter_by(status='active').count()
         sold_properties = session.query(Property).filter_by(status='sold').count()
 
-        return jsonify({
+        return ojson({
             'total': total_properties,
             'active': active_properties,
             'sold': sold_properties
@@ -485,4 +745,10 @@ if __name__ == '__main__':
     print(f"  Open: http://localhost:5001")
     print("\n" + "="*60 + "\n")
 
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    # Multi-threaded production server if installed, Flask dev server otherwise
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=5001)
+    else:
+        serve(app, host='0.0.0.0', port=5001, threads=SERVER_THREADS)
@@ -359,7 +359,6 @@ function createOpportunityPopup(opp) {
             <strong>Market:</strong> ${opp.market_status}<br>
             <strong>Score:</strong> ${opp.urgency_score}/100<br>
             <span class="urgency-badge ${urgencyClass}">${urgencyText}</span>
-            ${opp.notes ? `<br><br><em>${opp.notes}</em>` : ''}
         </div>
     `;
 }
@@ -427,9 +426,16 @@ async function importCSV() {
             body: formData
         });
 
-        const result = await response.json();
+        let result = await response.json();
 
-        if (response.ok && result.success) {
+        // Import runs in the background - poll its status until it's done
+        if (response.ok && result.job_id) {
+            statusMessage.textContent = 'Importing...';
+            progressFill.style.width = '75%';
+            result = await waitForImport(result.job_id, statusMessage);
+        }
+
+        if (response.ok && result.status === 'finished') {
             // Show success
             progressFill.style.width = '100%';
             statusMessage.textContent = 'Import complete!';
@@ -466,6 +472,25 @@ async function importCSV() {
     }
 }
 
+// Poll background import job until it finishes or fails
+async function waitForImport(jobId, statusMessage) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+
+        const response = await fetch(`/api/import/status?job_id=${jobId}`);
+        const job = await response.json();
+
+        if (!response.ok || job.status === 'failed') {
+            return { error: job.error || 'Import failed' };
+        }
+        if (job.status === 'finished') {
+            return job;
+        }
+
+        statusMessage.textContent = `Importing... ${job.total_processed} rows processed`;
+    }
+}
+
 // Refresh map data
 async function refreshMap() {
     await loadStats();
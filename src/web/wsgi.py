@@ -0,0 +1,18 @@
+"""
+WSGI entry point for running the Web UI under a production server
+
+Linux:   gunicorn --chdir src/web -w 1 -k gthread --threads 8 -b 0.0.0.0:5001 wsgi:app
+Windows: waitress-serve --listen=0.0.0.0:5001 --threads=8 wsgi:app  (run from src/web)
+
+Run ONE worker process with threads: import jobs, the import executor, the
+in-process response cache and the precomputed /api/properties payload live in
+process memory, so with several workers /api/import/status would 404 on the
+workers that did not start the job and the others would keep serving old data.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app  # noqa: E402
@@ -6,7 +6,10 @@ import imaplib
 import email
 from email.header import decode_header
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Only emails received in the last N days are searched
+SEARCH_DAYS = 30
 
 def test_connection():
     """Test IMAP connection to Gmail"""
@@ -44,34 +47,37 @@ def test_connection():
         imap.select(config['email']['folder'])
         print("   [OK] Folder selected")
 
-        # Search for emails from CML
-        print("\n4. Searching for emails from CML@canopylistings.com...")
-        search_criteria = '(FROM "CML@canopylistings.com")'
-        typ, data = imap.search(None, search_criteria)
-
-        email_ids = data[0].split()
-        print(f"   [OK] Found {len(email_ids)} emails from CML@canopylistings.com")
-
-        # Show recent emails with land keywords
-        print("\n5. Searching for land-related emails...")
-        land_search = '(OR SUBJECT "land" SUBJECT "lot" SUBJECT "acre" BODY "land" BODY "acre")'
-        typ, data = imap.search(None, land_search)
+        # Search for recent land emails from CML in one server-side SEARCH
+        # SINCE keeps the server from scanning the whole mailbox
+        since = (datetime.now() - timedelta(days=SEARCH_DAYS)).strftime('%d-%b-%Y')
+        print(f"\n4. Searching for emails from CML@canopylistings.com since {since}...")
+        print("\n5. ...with land keywords...")
+        land_search = (
+            f'(SINCE {since} FROM "CML@canopylistings.com" '
+            '(OR SUBJECT "land" SUBJECT "lot" SUBJECT "acre" BODY "land" BODY "acre"))'
+        )
+        typ, data = imap.uid('SEARCH', None, land_search)
 
         land_ids = data[0].split()
-        print(f"   [OK] Found {len(land_ids)} land-related emails")
+        print(f"   [OK] Found {len(land_ids)} land-related emails from CML@canopylistings.com")
 
         # Show last 5 land emails
         if land_ids:
             print("\n6. Recent land emails (last 5):")
             print("-" * 60)
 
-            for msg_id in land_ids[-5:]:
-                # Fetch email
-                typ, data = imap.fetch(msg_id, '(RFC822)')
-                raw_email = data[0][1]
+            # Fetch headers of all 5 emails in one command
+            # BODY.PEEK doesn't mark emails as read and skips the message body
+            msg_set = b','.join(land_ids[-5:])
+            typ, data = imap.uid('FETCH', msg_set, '(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE)])')
+
+            for item in data:
+                # Response is a list of (envelope, headers) tuples separated by b')'
+                if not isinstance(item, tuple):
+                    continue
 
-                # Parse email
-                msg = email.message_from_bytes(raw_email)
+                # Parse headers
+                msg = email.message_from_bytes(item[1])
 
                 # Get subject
                 subject = decode_header(msg["Subject"])[0][0]
@@ -1,3 +1,4 @@
+from sqlalchemy import func, case
 from src.data.database import get_session, Property
 
 session = get_session()
@@ -6,13 +7,14 @@ print('=' * 60)
 print('TESTING VACANT LAND PRICE FILTERS')
 print('=' * 60)
 
-# Get all vacant land (sqft <= 100)
-vacant_land = session.query(Property).filter(
+# Vacant land (sqft <= 100)
+vacant_filter = (
     Property.sqft <= 100,
     Property.archived == False
-).all()
+)
 
-print(f'\nTotal vacant land properties: {len(vacant_land)}')
+# Same as "list_price or sale_price" (0 counts as missing)
+price_col = func.coalesce(func.nullif(Property.list_price, 0), Property.sale_price)
 
 # Count by price ranges
 price_ranges = [
@@ -24,18 +26,6 @@ price_ranges = [
     (float('inf'), 'All prices')
 ]
 
-for max_price, label in price_ranges:
-    count = 0
-    for prop in vacant_land:
-        price = prop.list_price or prop.sale_price
-        if price and price <= max_price:
-            count += 1
-    print(f'{label}: {count} properties')
-
-print('\n' + '=' * 60)
-print('TESTING VACANT LAND SIZE FILTERS')
-print('=' * 60)
-
 # Count by size ranges (in acres)
 size_ranges = [
     (0.25, 'Over 0.25 acres'),
@@ -45,12 +35,38 @@ size_ranges = [
     (5, 'Over 5 acres'),
 ]
 
-for min_acres, label in size_ranges:
-    count = 0
-    min_sqft = min_acres * 43560  # Convert acres to sqft
-    for prop in vacant_land:
-        if prop.lot_size and prop.lot_size >= min_sqft:
-            count += 1
+
+def count_if(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END)"""
+    return func.sum(case((condition, 1), else_=0))
+
+
+# All counts in one query instead of loading every property
+price_counts = [
+    count_if(price_col > 0) if max_price == float('inf')
+    else count_if((price_col > 0) & (price_col <= max_price))
+    for max_price, _ in price_ranges
+]
+size_counts = [
+    count_if(Property.lot_size >= min_acres * 43560)  # Convert acres to sqft
+    for min_acres, _ in size_ranges
+]
+row = session.query(
+    func.count(Property.id), *price_counts, *size_counts
+).filter(*vacant_filter).one()
+
+total, counts = row[0], [count or 0 for count in row[1:]]
+
+print(f'\nTotal vacant land properties: {total}')
+
+for (max_price, label), count in zip(price_ranges, counts[:len(price_ranges)]):
+    print(f'{label}: {count} properties')
+
+print('\n' + '=' * 60)
+print('TESTING VACANT LAND SIZE FILTERS')
+print('=' * 60)
+
+for (min_acres, label), count in zip(size_ranges, counts[len(price_ranges):]):
     print(f'{label}: {count} properties')
 
 # Sample some properties
@@ -58,12 +74,18 @@ print('\n' + '=' * 60)
 print('SAMPLE VACANT LAND UNDER $100K')
 print('=' * 60)
 
-samples = [p for p in vacant_land if (p.list_price or p.sale_price) and (p.list_price or p.sale_price) <= 100000][:5]
-for prop in samples:
-    price = prop.list_price or prop.sale_price
-    acres = prop.lot_size / 43560 if prop.lot_size else 0
-    print(f'\nAddress: {prop.address}, {prop.city}')
+samples = session.query(
+    Property.address, Property.city, price_col, Property.lot_size
+).filter(
+    *vacant_filter,
+    price_col > 0,
+    price_col <= 100000
+).limit(5).all()
+
+for address, city, price, lot_size in samples:
+    acres = lot_size / 43560 if lot_size else 0
+    print(f'\nAddress: {address}, {city}')
     print(f'  Price: ${price:,.0f}')
-    print(f'  Lot size: {acres:.2f} acres ({prop.lot_size:,.0f} sqft)' if prop.lot_size else '  Lot size: N/A')
+    print(f'  Lot size: {acres:.2f} acres ({lot_size:,.0f} sqft)' if lot_size else '  Lot size: N/A')
 
-session.close()
\ No newline at end of file
+session.close()
@@ -4,12 +4,11 @@ Test Email Monitor - check monitoring system
 
 import sys
 import os
-import io
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Fix encoding for Windows
-if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from _console import use_utf8_stdout
+
+use_utf8_stdout()
 
 from monitors.email_monitor import EmailMonitor
 import logging
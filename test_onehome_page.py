@@ -4,17 +4,83 @@ Test fetching OneHome page directly
 
 import sys
 import os
-import io
 import re
 
-if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from _console import use_utf8_stdout
+
+use_utf8_stdout()
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from monitors.email_monitor import EmailMonitor
+from utils.files import write_text_atomic
+from _patterns import ONEHOME_URL
+from _page_cache import get_page, put_page
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+
+# selectolax (Lexbor, C) parses and extracts text without building Python tag objects
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# One keep-alive session for all page fetches (no TLS handshake per request)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+
+# Only <body> is built into the tree - <head> (scripts, styles, meta) never carries listing text
+_BODY_STRAINER = SoupStrainer('body')
+
+# Tags inside <body> without visible text
+_NON_TEXT_TAGS = ['script', 'style', 'svg', 'noscript', 'nav']
+
+
+def _declared_charset(response):
+    """Charset from the Content-Type header, or None (requests' ISO-8859-1 default for text/* is a guess)"""
+    if 'charset=' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+
+def _page_text(content: bytes, encoding: str = None) -> str:
+    """
+    Visible text of the page <body> (selectolax if installed, otherwise BeautifulSoup + lxml)
+
+    The raw bytes go straight to the parser - no response.text decode pass.
+    encoding is the charset declared by the server, if any.
+    """
+    if LexborHTMLParser is not None:
+        # Lexbor reads bytes as UTF-8
+        if encoding and encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            content = content.decode(encoding, errors='replace')
+        tree = LexborHTMLParser(content)
+        if tree.body is None:
+            return ''
+        for node in tree.body.css(', '.join(_NON_TEXT_TAGS)):
+            node.decompose()
+        return tree.body.text()
+
+    # lxml builds the tree in C; a declared charset skips bs4's encoding detection
+    soup = BeautifulSoup(content, 'lxml', parse_only=_BODY_STRAINER, from_encoding=encoding)
+    for tag in soup(_NON_TEXT_TAGS):
+        tag.decompose()
+    return soup.get_text()
+
+
+# Patterns compiled once
+_PRICE_RE = re.compile(r'\$([0-9,]+)')
+_ACRES_RE = re.compile(r'(\d+\.?\d*)\s*acres?', re.IGNORECASE)
+_ADDR_RE = re.compile(r'\d+\s+[\w\s]+(?:St|Street|Ave|Road|Dr|Lane)')
 
 def test_onehome_page():
     """Test fetching a OneHome page"""
@@ -41,24 +107,25 @@ def test_onehome_page():
     msg_id = email_ids[-1]
 
     # Get the email
-    import email as email_lib
-    from email.header import decode_header
+    from email.parser import BytesParser
+    from email.policy import default as email_default
+    from email.iterators import typed_subpart_iterator
 
-    typ, data = monitor.imap.fetch(msg_id, '(RFC822)')
+    # BODY.PEEK[] returns the full message without setting \Seen, so the monitor still sees it as new
+    typ, data = monitor.imap.fetch(msg_id, '(BODY.PEEK[])')
     raw_email = data[0][1]
-    msg = email_lib.message_from_bytes(raw_email)
+    msg = BytesParser(policy=email_default).parsebytes(raw_email)
+
+    # Get HTML body (first text/html part, decoded with its declared charset)
+    part = next(typed_subpart_iterator(msg, 'text', 'html'), None)
+    html_body = part.get_content() if part else None
 
-    # Get HTML body
-    html_body = None
-    if msg.is_multipart():
-        for part in msg.walk():
-            if part.get_content_type() == "text/html":
-                html_body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                break
+    if not html_body:
+        print("No HTML body found")
+        return
 
     # Extract link
-    pattern = r'https://portal\.onehome\.com/[^\s<>"\']+properties[^\s<>"\']+'
-    match = re.search(pattern, html_body)
+    match = ONEHOME_URL.search(html_body)
 
     if not match:
         print("No link found")
@@ -67,22 +134,26 @@ def test_onehome_page():
     url = match.group(0)
     print(f"\nLink: {url}")
 
-    # Fetch the page
-    print("\nFetching page...")
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
+    # Fetch the page (unless a recent copy is cached)
+    content = get_page(url)
+    charset = None
+    if content is not None:
+        print("\nUsing cached page (set ONEHOME_CACHE_TTL=0 to refetch)")
+    else:
+        print("\nFetching page...")
+        response = _SESSION.get(url, timeout=15)
+        print(f"Status: {response.status_code}")
 
-    response = requests.get(url, headers=headers, timeout=15)
-    print(f"Status: {response.status_code}")
+        content = response.content
+        charset = _declared_charset(response)
+        if response.ok:
+            put_page(url, content)
 
-    # Parse HTML
-    soup = BeautifulSoup(response.text, 'html.parser')
-    text = soup.get_text()
+    # Extract page text
+    text = _page_text(content, charset)
 
     # Save to file for inspection
-    with open('onehome_page.txt', 'w', encoding='utf-8') as f:
-        f.write(text)
+    write_text_atomic('onehome_page.txt', text)
 
     print(f"\nPage text saved to: onehome_page.txt ({len(text)} chars)")
 
@@ -90,21 +161,20 @@ def test_onehome_page():
     print("\nLooking for patterns...")
 
     # Price
-    price_matches = re.findall(r'\$([0-9,]+)', text)
+    price_matches = _PRICE_RE.findall(text)
     if price_matches:
         print(f"  Prices found: {price_matches[:5]}")
 
     # Acres
-    acres_matches = re.findall(r'(\d+\.?\d*)\s*acres?', text, re.IGNORECASE)
+    acres_matches = _ACRES_RE.findall(text)
     if acres_matches:
         print(f"  Acres found: {acres_matches[:5]}")
 
     # Address
-    address_matches = re.findall(r'\d+\s+[\w\s]+(?:St|Street|Ave|Road|Dr|Lane)', text)
+    address_matches = _ADDR_RE.findall(text)
     if address_matches:
         print(f"  Addresses found: {address_matches[:3]}")
 
-    monitor.imap.logout()
     print("\n" + "=" * 60)
 
 if __name__ == "__main__":
@@ -4,10 +4,10 @@ Test parsing one email from CML
 
 import sys
 import os
-import io
 
-if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from _console import use_utf8_stdout
+
+use_utf8_stdout()
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -29,6 +29,9 @@ def test_one_email():
     # Create monitor
     monitor = EmailMonitor('email_config.json')
 
+    # Don't load OneHome pages of listings the email already prices over the filter
+    monitor.config['monitoring']['prefilter_by_email_price'] = True
+
     # Connect to email
     if not monitor.connect_to_email():
         print("Failed to connect")
@@ -46,8 +49,11 @@ def test_one_email():
     msg_id = email_ids[-1]
     print(f"\nProcessing email ID: {msg_id.decode()}")
 
+    # BODY.PEEK[] returns the full message without setting \Seen, so the monitor still sees it as new
+    typ, data = monitor.imap.fetch(msg_id, '(BODY.PEEK[])')
+
     # Process the email - returns list of listings
-    listings = monitor.process_email(msg_id)
+    listings = monitor.process_email(msg_id, raw_email=data[0][1])
 
     print("\n" + "=" * 60)
     print("RESULT:")
@@ -74,7 +80,7 @@ def test_one_email():
     else:
         print("\nNo listings found in email")
 
-    monitor.imap.logout()
+    monitor.close_drivers()
     print("\n" + "=" * 60)
 
 if __name__ == "__main__":
@@ -4,21 +4,47 @@ Test Selenium page content
 
 import sys
 import os
-import io
 import re
-import time
 
-if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from _console import use_utf8_stdout
+
+use_utf8_stdout()
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from monitors.email_monitor import EmailMonitor
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from utils.files import write_text_atomic
+from _patterns import ONEHOME_URL
+from _browser import get_driver, reset_driver
+from _page_cache import get_page, put_page
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# Whole-page text scans use RE2 (linear time, no backtracking) if installed
+# Flags are inline (?i:...) so the pattern works with both engines
+try:
+    import re2 as page_re
+except ImportError:
+    page_re = re
+
+# All page fields in one alternation - the text is scanned once instead of once per field
+# Each field is a named group with a <field>_value group for the captured value
+_PAGE_FIELDS = ('lot_size', 'mls', 'price', 'acres', 'address')
+_PAGE_FIELDS_RE = page_re.compile(
+    r'(?P<lot_size>(?i:Lot Size)[:\s]+(?P<lot_size_value>[^\n]+))'
+    r'|(?P<mls>(?i:MLS)[#\s:]+(?P<mls_value>[A-Za-z0-9\-]+))'
+    r'|(?P<price>\$(?P<price_value>[0-9,]+))'
+    r'|(?P<acres>(?P<acres_value>\d+\.?\d*)\s*(?i:acres?|ac\b))'
+    r'|(?P<address>(?P<address_value>\d+\s+[\w\s]{3,30}(?:St|Street|Ave|Road|Dr|Lane|Way|Blvd)))'
+)
+
+
+def _listing_rendered(driver):
+    """True once the page body shows a price and an acreage"""
+    text = driver.find_element(By.TAG_NAME, 'body').text
+    return '$' in text and 'acre' in text.lower()
 
 def test_selenium_content():
     """Test Selenium content"""
@@ -45,23 +71,25 @@ def test_selenium_content():
     msg_id = email_ids[-1]
 
     # Get the email
-    import email as email_lib
+    from email.parser import BytesParser
+    from email.policy import default as email_default
+    from email.iterators import typed_subpart_iterator
 
-    typ, data = monitor.imap.fetch(msg_id, '(RFC822)')
+    # BODY.PEEK[] returns the full message without setting \Seen, so the monitor still sees it as new
+    typ, data = monitor.imap.fetch(msg_id, '(BODY.PEEK[])')
     raw_email = data[0][1]
-    msg = email_lib.message_from_bytes(raw_email)
+    msg = BytesParser(policy=email_default).parsebytes(raw_email)
+
+    # Get HTML body (first text/html part, decoded with its declared charset)
+    part = next(typed_subpart_iterator(msg, 'text', 'html'), None)
+    html_body = part.get_content() if part else None
 
-    # Get HTML body
-    html_body = None
-    if msg.is_multipart():
-        for part in msg.walk():
-            if part.get_content_type() == "text/html":
-                html_body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                break
+    if not html_body:
+        print("No HTML body found")
+        return
 
     # Extract link
-    pattern = r'https://portal\.onehome\.com/[^\s<>"\']+properties[^\s<>"\']+'
-    match = re.search(pattern, html_body)
+    match = ONEHOME_URL.search(html_body)
 
     if not match:
         print("No link found")
@@ -70,74 +98,69 @@ def test_selenium_content():
     url = match.group(0)
     print(f"\nLink: {url[:80]}...")
 
-    # Set up Chrome
-    chrome_options = Options()
-    chrome_options.add_argument('--headless=new')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-
-    driver = webdriver.Chrome(options=chrome_options)
+    cached_source = get_page(url + '#html')
+    cached_text = get_page(url + '#text')
 
-    try:
-        print("\nLoading page with Selenium...")
-        driver.get(url)
+    if cached_source is not None and cached_text is not None:
+        print("\nUsing cached page (set ONEHOME_CACHE_TTL=0 to reload)")
+        page_source = cached_source.decode('utf-8')
+        text = cached_text.decode('utf-8')
+    else:
+        # Shared headless Chrome (started once per process, quit at exit)
+        driver = get_driver()
 
-        # Wait for body
-        wait = WebDriverWait(driver, 10)
-        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        try:
+            print("\nLoading page with Selenium...")
+            driver.get(url)
 
-        # Wait for content
-        time.sleep(5)
+            # Wait for body
+            wait = WebDriverWait(driver, 10)
+            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
-        # Get page source
-        page_source = driver.page_source
+            # Wait until the listing details are rendered (price and acreage in the text)
+            try:
+                WebDriverWait(driver, 8).until(_listing_rendered)
+            except TimeoutException:
+                print("Listing details did not appear within 8s - using the page as is")
 
-        # Save to file
-        with open('selenium_page.html', 'w', encoding='utf-8') as f:
-            f.write(page_source)
+            # Get page source and text
+            page_source = driver.page_source
+            text = driver.find_element(By.TAG_NAME, "body").text
 
-        print(f"Page saved to: selenium_page.html ({len(page_source)} chars)")
+        finally:
+            reset_driver(driver)
 
-        # Extract text
-        text = driver.find_element(By.TAG_NAME, "body").text
+        put_page(url + '#html', page_source.encode('utf-8'))
+        put_page(url + '#text', text.encode('utf-8'))
 
-        # Save text too
-        with open('selenium_text.txt', 'w', encoding='utf-8') as f:
-            f.write(text)
+    # Save to file
+    write_text_atomic('selenium_page.html', page_source)
 
-        print(f"Text saved to: selenium_text.txt ({len(text)} chars)")
+    print(f"Page saved to: selenium_page.html ({len(page_source)} chars)")
 
-        # Look for patterns in text
-        print("\n" + "=" * 60)
-        print("PATTERNS FOUND:")
-        print("=" * 60)
+    # Save text too
+    write_text_atomic('selenium_text.txt', text)
 
-        # Prices
-        prices = re.findall(r'\$([0-9,]+)', text)
-        print(f"\nPrices: {prices[:10]}")
+    print(f"Text saved to: selenium_text.txt ({len(text)} chars)")
 
-        # Acres/Lot size
-        acres = re.findall(r'(\d+\.?\d*)\s*(?:acres?|ac\b)', text, re.IGNORECASE)
-        print(f"Acres: {acres}")
-
-        # Lot Size
-        lot_size = re.findall(r'Lot Size[:\s]+([^\n]+)', text, re.IGNORECASE)
-        print(f"Lot Size: {lot_size}")
-
-        # Address-like patterns
-        addresses = re.findall(r'\d+\s+[\w\s]{3,30}(?:St|Street|Ave|Road|Dr|Lane|Way|Blvd)', text)
-        print(f"Addresses: {addresses[:5]}")
+    # Look for patterns in text
+    print("\n" + "=" * 60)
+    print("PATTERNS FOUND:")
+    print("=" * 60)
 
-        # MLS
-        mls = re.findall(r'MLS[#\s:]+([A-Z0-9\-]+)', text, re.IGNORECASE)
-        print(f"MLS: {mls}")
+    found = {field: [] for field in _PAGE_FIELDS}
+    for match in _PAGE_FIELDS_RE.finditer(text):
+        field = next(f for f in _PAGE_FIELDS if match.group(f) is not None)
+        found[field].append(match.group(field + '_value'))
 
-        print("\nFirst 1000 chars of text:")
-        print(text[:1000])
+    print(f"\nPrices: {found['price'][:10]}")
+    print(f"Acres: {found['acres']}")
+    print(f"Lot Size: {found['lot_size']}")
+    print(f"Addresses: {found['address'][:5]}")
+    print(f"MLS: {found['mls']}")
 
-    finally:
-        driver.quit()
-        monitor.imap.logout()
+    print("\nFirst 1000 chars of text:")
+    print(text[:1000])
 
     print("\n" + "=" * 60)
 
@@ -0,0 +1,15 @@
+"""
+Shared pytest setup: src/ on the path and a throwaway SQLite database
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'src', 'web'))
+
+# Must be set before data.database creates its engine
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='land-tests-'), 'test.db')
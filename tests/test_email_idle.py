@@ -0,0 +1,107 @@
+"""
+IMAP IDLE wait of the email monitor against a scripted in-process server
+"""
+
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+
+from monitors import email_monitor  # noqa: E402
+from monitors.email_monitor import EmailMonitor  # noqa: E402
+
+
+class FakeServer(threading.Thread):
+    """Answers IDLE with "+ idling" followed by updates, and DONE with the tagged OK"""
+
+    def __init__(self, sock, updates=b''):
+        super().__init__(daemon=True)
+        self.sock = sock
+        self.updates = updates
+        self.received = []
+
+    def run(self):
+        tag = None
+        for line in self.sock.makefile('rb'):
+            self.received.append(line)
+            if line.endswith(b' IDLE\r\n'):
+                tag = line.split()[0]
+                self.sock.sendall(b'+ idling\r\n' + self.updates)
+            elif line == b'DONE\r\n':
+                self.sock.sendall(tag + b' OK IDLE terminated\r\n')
+
+
+class PlainSocket:
+    """Plain socket with the pending() of ssl.SSLSocket"""
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def pending(self):
+        return 0
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+class FakeImap:
+    """The parts of imaplib.IMAP4 the IDLE loop uses"""
+
+    def __init__(self, sock, capabilities=('IMAP4REV1', 'IDLE')):
+        self.sock = PlainSocket(sock)
+        self.file = sock.makefile('rb')
+        self.capabilities = capabilities
+
+    def send(self, data):
+        self.sock.sendall(data)
+
+    def readline(self):
+        return self.file.readline()
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # No config or state files
+    return EmailMonitor(config_path=str(tmp_path / 'email_config.json'))
+
+
+def connect(monitor, updates=b'', **imap_kwargs):
+    client, server_sock = socket.socketpair()
+    client.settimeout(5)
+    server = FakeServer(server_sock, updates)
+    server.start()
+    monitor.imap = FakeImap(client, **imap_kwargs)
+    return server
+
+
+def test_update_ends_idle(monitor):
+    # Update arrives in the same segment as "+ idling" - must be seen without waiting
+    server = connect(monitor, updates=b'* 4 EXISTS\r\n')
+
+    assert monitor.wait_for_new_mail(timeout=5) is True
+    assert server.received == [b'idle1 IDLE\r\n', b'DONE\r\n']
+
+
+def test_timeout_without_updates(monitor):
+    # Keepalives aren't mailbox changes
+    server = connect(monitor, updates=b'* OK Still here\r\n')
+
+    assert monitor.wait_for_new_mail(timeout=0.2) is False
+    assert server.received == [b'idle1 IDLE\r\n', b'DONE\r\n']
+
+    # Connection is left in a usable state for the next IDLE
+    server.updates = b'* 1 EXPUNGE\r\n'
+    assert monitor.wait_for_new_mail(timeout=5) is True
+    assert server.received[2:] == [b'idle2 IDLE\r\n', b'DONE\r\n']
+
+
+def test_server_without_idle_polls(monitor, monkeypatch):
+    server = connect(monitor, capabilities=('IMAP4REV1',))
+    slept = []
+    monkeypatch.setattr(email_monitor.time, 'sleep', slept.append)
+
+    assert monitor.wait_for_new_mail(timeout=30) is False
+    assert slept == [30]
+    assert server.received == []
@@ -0,0 +1,131 @@
+"""
+Redfin CSV import spanning several read_csv chunks
+"""
+
+import csv
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('flask')
+pytest.importorskip('flask_caching')
+
+import app as web_app  # noqa: E402
+from data.database import Base, engine, get_session, Property  # noqa: E402
+
+HEADER = ['SALE TYPE', 'SOLD DATE', 'PROPERTY TYPE', 'ADDRESS', 'CITY', 'STATE OR PROVINCE',
+          'ZIP OR POSTAL CODE', 'PRICE', 'SQUARE FEET', 'LOT SIZE', 'STATUS', 'MLS#',
+          'LATITUDE', 'LONGITUDE',
+          'URL (SEE https://www.redfin.com/buy-a-home/comparative-market-analysis FOR INFO ON PRICING)']
+
+
+def write_redfin_csv(path, rows):
+    """Redfin export: header, MLS warning row, listings"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerow(['In accordance with local MLS rules, some MLS listings are not included.']
+                        + [''] * (len(HEADER) - 1))
+        writer.writerows(rows)
+
+
+def listing_row(i, price=300000):
+    return ['MLS Listing', '', 'Single Family Residential', f'{i} Main St', 'Asheville', 'NC',
+            '28801', price, 1500, 5000, 'Active', 4123400 + i, 35.6, -82.5,
+            f'https://www.redfin.com/NC/Asheville/{i}']
+
+
+@pytest.fixture(autouse=True)
+def clean_db(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Several chunks even for a small file
+    monkeypatch.setattr(web_app.iter_redfin_chunks, '__defaults__', (3,))
+    yield
+
+
+def start_job(filename='export.csv'):
+    job_id = 'test-job'
+    web_app.import_jobs[job_id] = {
+        'job_id': job_id, 'status': 'queued', 'filename': filename,
+        'total_processed': 0, 'imported': 0, 'updated': 0, 'errors': []
+    }
+    return job_id
+
+
+def test_mls_numbers_have_one_format_across_chunks(tmp_path):
+    path = tmp_path / 'export.csv'
+    write_redfin_csv(path, [listing_row(i) for i in range(8)])
+
+    mls = [m for df in web_app.iter_redfin_chunks(str(path)) for m in df['mls_number']]
+
+    assert mls == [str(4123400 + i) for i in range(8)]
+
+
+def test_import_over_one_chunk_then_reimport_updates(tmp_path):
+    path = tmp_path / 'export.csv'
+    write_redfin_csv(path, [listing_row(i) for i in range(8)])
+    job_id = start_job()
+    web_app.run_import(job_id, str(path))
+
+    job = web_app.import_jobs[job_id]
+    assert job['status'] == 'finished', job
+    assert (job['imported'], job['updated']) == (8, 0)
+
+    # Same listings again (new prices) - updated in place, no duplicates
+    write_redfin_csv(path, [listing_row(i, price=250000) for i in range(8)])
+    job_id = start_job()
+    web_app.run_import(job_id, str(path))
+
+    job = web_app.import_jobs[job_id]
+    assert (job['imported'], job['updated']) == (0, 8)
+
+    session = get_session()
+    try:
+        props = session.query(Property).all()
+        assert len(props) == 8
+        assert {p.mls_number for p in props} == {str(4123400 + i) for i in range(8)}
+        assert {p.list_price for p in props} == {250000}
+    finally:
+        session.close()
+
+
+def test_bad_row_fails_alone(tmp_path):
+    # Database rejects one listing - the rest of its batch is still written
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TRIGGER reject_one BEFORE INSERT ON properties "
+            "WHEN NEW.mls_number = '4123402' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+
+    path = tmp_path / 'export.csv'
+    write_redfin_csv(path, [listing_row(i) for i in range(8)])
+    job_id = start_job()
+    web_app.run_import(job_id, str(path))
+
+    job = web_app.import_jobs[job_id]
+    assert job['status'] == 'finished', job
+    assert (job['imported'], job['updated']) == (7, 0)
+    assert len(job['errors']) == 1 and job['errors'][0].startswith('MLS 4123402')
+
+    session = get_session()
+    try:
+        assert session.query(Property).count() == 7
+    finally:
+        session.close()
+
+
+def test_cache_refresh_failure_is_recorded(tmp_path, monkeypatch):
+    def broken_rebuild():
+        raise RuntimeError('cache down')
+    monkeypatch.setattr(web_app, 'rebuild_properties_cache', broken_rebuild)
+
+    path = tmp_path / 'export.csv'
+    write_redfin_csv(path, [listing_row(i) for i in range(2)])
+    job_id = start_job()
+    web_app.run_import(job_id, str(path))
+
+    job = web_app.import_jobs[job_id]
+    assert job['status'] == 'finished'
+    assert job['cache_error'] == 'cache down'
+    assert not path.exists()
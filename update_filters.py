@@ -2,10 +2,15 @@
 Simple UI to update email monitor filters
 """
 
-import json
 import sys
 import io
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -14,14 +19,20 @@ CONFIG_FILE = 'email_config.json'
 
 def load_config():
     """Load current configuration"""
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    with open(CONFIG_FILE, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
 
 
 def save_config(config):
-    """Save configuration"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=4)
+    """Save configuration (2-space indent - the only indent orjson supports)"""
+    if orjson:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        data = (json.dumps(config, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+    with open(CONFIG_FILE, 'wb') as f:
+        f.write(data)
 
 
 def show_current_filters(config):